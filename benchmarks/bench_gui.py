@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+#
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2024-2025 Robert French (rfrench3, TealMango)
+
+'''
+Benchmarks how quickly the app responds to input, headless (QT_QPA_PLATFORM=offscreen unless another platform is set),
+against a synthetic scopebuddy directory (see synthetic_tree.py) in a temporary XDG_CONFIG_HOME.
+
+The real main window is driven with QTest: key presses and mouse clicks are delivered to the widgets,
+so every event goes through the same signals and data_changed handlers as it would for a user.
+The latency of an event is the time from sending it until the event queue is empty again,
+which includes the repaints it caused.
+
+- opening configs by clicking them in the file tree, and closing them with the status bar button
+- switching tabs by clicking the tab bar, the first time a page is shown (it is built then) and afterwards
+- typing into the gamescope line edits, general settings' display name and the launch options
+- toggling checkboxes on the gamescope and general settings pages
+- adding environment variables: clicking add, typing the variable and pressing enter, for --env-rows rows
+
+Typed input is never applied, each page is bound to its file again afterwards, which drops it.
+
+Usage: bench_gui.py [-n launchers] [-m configs] [-k lines] [--rounds rounds] [--env-rows rows] [-o results.json]
+Results are written as JSON (see harness.py), to stdout unless -o is given.
+'''
+
+import os, time, shutil, tempfile, argparse
+
+import harness
+import synthetic_tree
+
+
+'''
+The AppDriver class:
+PURPOSE: run the app's main window without an event loop of its own, and deliver input to it the way a user would.
+OUTPUT: the latency of each input (see event), in seconds.
+STORED: the QApplication, the main window and its ApplicationLogic, and how many dialogs had to be dismissed.
+A dialog would wait for a user forever, so any that opens is dismissed right away (and counted, it means
+the benchmark hit a prompt it was not meant to).
+'''
+class AppDriver:
+    def __init__(self) -> None:
+        from PySide6.QtWidgets import QApplication
+        from PySide6.QtCore import QTimer
+        from PySide6.QtTest import QTest
+        import main as app_main
+        import shared_data
+
+        self.QTest = QTest
+        self.shared_data = shared_data
+        self.app_main = app_main
+        self.app = QApplication.instance() or QApplication([])
+
+        self.dismissed_dialogs: int = 0
+        self.dialog_timer = QTimer()
+        self.dialog_timer.timeout.connect(self._dismiss_dialog)
+        self.dialog_timer.start(50)
+
+        # what main() does, without waiting in app.exec()
+        self.window = app_main.MainWindow()
+        self.logic = app_main.ApplicationLogic(self.window.ui_widget)
+        self.window.logic = self.logic
+        self.window.show()
+        self.wait_for_scan()
+
+    def _dismiss_dialog(self) -> None:
+        dialog = self.app.activeModalWidget()
+        if dialog is not None:
+            self.dismissed_dialogs += 1
+            dialog.reject() #type:ignore
+
+    def wait_for_scan(self) -> None:
+        while self.logic.directory_scanner.scanning:
+            self.app.processEvents()
+        self.app.processEvents()
+
+    def event(self, send) -> float:
+        """Calls send (which delivers an input), then processes events until none are left.
+        Returns how long that took, in seconds."""
+        start = time.perf_counter()
+        send()
+        self.app.processEvents()
+        return time.perf_counter() - start
+
+    def click(self, widget, position=None) -> float:
+        from PySide6.QtCore import Qt
+        if position is None:
+            return self.event(lambda: self.QTest.mouseClick(widget, Qt.MouseButton.LeftButton))
+        return self.event(lambda: self.QTest.mouseClick(widget, Qt.MouseButton.LeftButton, Qt.KeyboardModifier.NoModifier, position))
+
+    def type_text(self, widget, text:str) -> list[float]:
+        """Types text into widget one key at a time, returns the latency of each key."""
+        return [self.event(lambda: self.QTest.keyClick(widget, character)) for character in text]
+
+    def press_key(self, widget, key) -> float:
+        return self.event(lambda: self.QTest.keyClick(widget, key))
+
+    # file tree
+
+    def config_paths(self) -> list[str]:
+        """Returns the path of every config in the file tree, in the order they are shown."""
+        model = self.logic.file_tree_model
+        paths = []
+        for row in range(model.rowCount()):
+            launcher = model.index(row, 0)
+            while model.canFetchMore(launcher):
+                model.fetchMore(launcher)
+            paths += [model.path(model.index(child, 0, launcher)) for child in range(model.rowCount(launcher))]
+        return paths
+
+    def _tree_index(self, path:str):
+        model = self.logic.file_tree_model
+        for row in range(model.rowCount()):
+            launcher = model.index(row, 0)
+            while model.canFetchMore(launcher):
+                model.fetchMore(launcher)
+            for child in range(model.rowCount(launcher)):
+                index = model.index(child, 0, launcher)
+                if model.path(index) == path:
+                    return launcher, index
+        raise ValueError(f"{path} is not in the file tree")
+
+    def open_config(self, path:str) -> float:
+        """Clicks the config in the file tree (expanding its launcher first, untimed)."""
+        launcher, index = self._tree_index(path)
+        tree = self.logic.file_tree
+        tree.expand(launcher)
+        tree.scrollTo(index)
+        self.app.processEvents()
+        return self.click(tree.viewport(), tree.visualRect(index).center())
+
+    def close_config(self) -> float:
+        return self.click(self.logic.status_button)
+
+    def switch_tab(self, index:int) -> float:
+        tab_bar = self.logic.mainFileEdit.tabBar()
+        return self.click(tab_bar, tab_bar.tabRect(index).center())
+
+    def page(self, index:int):
+        return self.logic.page_logic(index)
+
+    def drop_input(self, index:int) -> None:
+        """Binds a page to its file again, dropping what was typed into it."""
+        page = self.page(index)
+        page.bind(page.file)
+        self.shared_data.unsaved_changes = False
+        self.app.processEvents()
+
+
+GENERAL, ENV_VARS, GAMESCOPE, LAUNCH_OPTIONS = range(4)
+
+
+def open_close_benchmarks(driver:AppDriver, paths:list[str], rounds:int) -> list[dict]:
+    # the first open also builds the first page
+    first_open = driver.open_config(paths[0])
+    driver.close_config()
+
+    opens, closes = [], []
+    for number in range(rounds):
+        opens.append(driver.open_config(paths[(number + 1) % len(paths)]))
+        closes.append(driver.close_config())
+    return [
+        harness.summarize("open config, first (tree click)", [first_open]),
+        harness.summarize("open config (tree click)", opens),
+        harness.summarize("close config (status bar button)", closes)
+    ]
+
+
+def tab_benchmarks(driver:AppDriver, rounds:int) -> list[dict]:
+    """Expects a config to be open on the first tab, with no other page built yet."""
+    first_shows = [driver.switch_tab(index) for index in (ENV_VARS, GAMESCOPE, LAUNCH_OPTIONS)]
+    switches = []
+    for _ in range(rounds):
+        for index in (GENERAL, ENV_VARS, GAMESCOPE, LAUNCH_OPTIONS):
+            switches.append(driver.switch_tab(index))
+    return [
+        harness.summarize("switch tab, first show (page built)", first_shows),
+        harness.summarize("switch tab", switches)
+    ]
+
+
+def typing_benchmarks(driver:AppDriver, rounds:int) -> list[dict]:
+    from PySide6.QtCore import Qt
+    results = []
+
+    driver.switch_tab(GAMESCOPE)
+    gamescope = driver.page(GAMESCOPE)
+    fields = [
+        (gamescope.lineEdit_oWidth, "2560"),
+        (gamescope.lineEdit_oHeight, "1440"),
+        (gamescope.lineEdit_fps, "120"),
+        (gamescope.lineEdit_unimplementedSettings, " --expose-wayland")
+    ]
+    keys, erases = [], []
+    for _ in range(rounds):
+        for line_edit, text in fields:
+            line_edit.end(False)
+            keys += driver.type_text(line_edit, text)
+            erases += [driver.press_key(line_edit, Qt.Key.Key_Backspace) for _ in text]
+        driver.drop_input(GAMESCOPE)
+    results.append(harness.summarize("gamescope: key in line edit", keys))
+    results.append(harness.summarize("gamescope: backspace in line edit", erases))
+
+    checkboxes = [
+        gamescope.checkBox_fullscreen, gamescope.checkBox_borderless, gamescope.checkBox_hdr,
+        gamescope.checkBox_mango, gamescope.checkBox_adaptiveSync
+    ]
+    toggles = []
+    for _ in range(rounds):
+        for checkbox in checkboxes:
+            toggles += [driver.click(checkbox), driver.click(checkbox)]
+    driver.drop_input(GAMESCOPE)
+    results.append(harness.summarize("gamescope: toggle checkbox", toggles))
+
+    driver.switch_tab(GENERAL)
+    general = driver.page(GENERAL)
+    keys, toggles = [], []
+    for _ in range(rounds):
+        general.display_name.end(False)
+        keys += driver.type_text(general.display_name, " (edited)")
+        for checkbox in (general.scb_auto_res, general.scb_auto_hdr, general.scb_auto_vrr):
+            toggles += [driver.click(checkbox), driver.click(checkbox)]
+        driver.drop_input(GENERAL)
+    results.append(harness.summarize("general settings: key in display name", keys))
+    results.append(harness.summarize("general settings: toggle checkbox", toggles))
+
+    driver.switch_tab(LAUNCH_OPTIONS)
+    launch_options = driver.page(LAUNCH_OPTIONS)
+    keys = []
+    for _ in range(rounds):
+        launch_options.line_edit.end(False)
+        keys += driver.type_text(launch_options.line_edit, " -dx12 -high")
+        driver.drop_input(LAUNCH_OPTIONS)
+    results.append(harness.summarize("launch options: key in line edit", keys))
+
+    return results
+
+
+def env_var_benchmarks(driver:AppDriver, rows:int) -> list[dict]:
+    from PySide6.QtCore import Qt
+    from PySide6.QtWidgets import QLineEdit
+
+    driver.switch_tab(ENV_VARS)
+    env_vars = driver.page(ENV_VARS)
+    viewport = env_vars.env_vars_list.viewport()
+
+    adds, keys, commits = [], [], []
+    start = time.perf_counter()
+    for row in range(rows):
+        adds.append(driver.click(env_vars.add_entry))
+        editor = driver.app.focusWidget()
+        if not isinstance(editor, QLineEdit):
+            editor = next(child for child in viewport.findChildren(QLineEdit) if child.isVisible())
+        keys += driver.type_text(editor, f"BENCH_VAR_{row}=1")
+        commits.append(driver.press_key(editor, Qt.Key.Key_Return))
+    total = time.perf_counter() - start
+    driver.drop_input(ENV_VARS)
+
+    return [
+        harness.summarize("environment variables: add row (button)", adds),
+        harness.summarize("environment variables: key in row", keys),
+        harness.summarize("environment variables: commit row (enter)", commits),
+        harness.summarize(f"environment variables: {rows} rows, total", [total])
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks how quickly the app's widgets respond to input, headless.")
+    parser.add_argument("-n", "--launchers", type=int, default=10)
+    parser.add_argument("-m", "--configs", type=int, default=20)
+    parser.add_argument("-k", "--lines", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rounds", type=int, default=20, help="how many times each interaction is repeated")
+    parser.add_argument("--env-rows", type=int, default=500, help="environment variables to add")
+    parser.add_argument("-o", "--output", help="JSON file to write, stdout if not given")
+    arguments = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    work_dir = tempfile.mkdtemp(prefix="scb-bench-")
+    try:
+        config_home = os.path.join(work_dir, "config")
+        os.environ["XDG_CONFIG_HOME"] = config_home
+        os.environ["XDG_CACHE_HOME"] = os.path.join(work_dir, "cache")
+        tree = synthetic_tree.build_tree(config_home, arguments.launchers, arguments.configs, arguments.lines, arguments.seed)
+
+        harness.use_source()
+        driver = AppDriver()
+        paths = [path for path in driver.config_paths() if os.path.dirname(path) != tree['scb_dir']] # not Global
+
+        results = open_close_benchmarks(driver, paths, arguments.rounds)
+        driver.open_config(paths[0])
+        results += tab_benchmarks(driver, arguments.rounds)
+        results += typing_benchmarks(driver, arguments.rounds)
+        results += env_var_benchmarks(driver, arguments.env_rows)
+        driver.close_config()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    harness.print_table(results)
+    parameters = {key: value for key, value in tree.items() if key not in ('config_home', 'scb_dir', 'appid_dir')}
+    parameters.update(
+        rounds=arguments.rounds,
+        env_rows=arguments.env_rows,
+        platform=os.environ["QT_QPA_PLATFORM"],
+        dismissed_dialogs=driver.dismissed_dialogs
+    )
+    harness.write_results("gui", parameters, results, arguments.output)
+
+
+if __name__ == "__main__":
+    main()
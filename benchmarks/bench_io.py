@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+#
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2024-2025 Robert French (rfrench3, TealMango)
+
+'''
+Benchmarks the file layer (src/file_manager.py and src/directory_index.py) against a synthetic scopebuddy directory
+(see synthetic_tree.py), built in a temporary XDG_CONFIG_HOME so real configs are never touched.
+
+- reading and parsing a config (ConfigFile), and parsing alone (ConfigFile with contents)
+- check_for_exact_line, for a line that is in the config and one that is not
+- edit_export_lines, edit_gamescope_line, edit_exact_lines and edit_launch_options, each on a config on disk
+  (the edit is written, as in the app) and on one kept in memory (the edit alone). Each call undoes the last one,
+  so every call changes the file and the config does not grow between runs.
+- ScopebuddyDirectory scans: without an index (serial, and on THREADED_WORKERS threads), and through a DirectoryIndex,
+  both cold (no saved index, empty config cache) and warm (saved index, nothing changed)
+
+Usage: bench_io.py [-n launchers] [-m configs] [-k lines] [--repeat runs] [--scan-repeat runs] [-o results.json]
+Results are written as JSON (see harness.py), to stdout unless -o is given.
+'''
+
+import os, shutil, tempfile, argparse
+
+import harness
+import synthetic_tree
+
+# threads of the threaded scan benchmark (the app scans serially unless SCOPEBUDDY_GUI_SCAN_WORKERS is set)
+THREADED_WORKERS: int = 4
+
+
+def config_benchmarks(fman, path:str, repeat:int) -> list[dict]:
+    results = []
+
+    with open(path) as file:
+        contents = file.read()
+    results.append(harness.summarize("ConfigFile read", harness.measure(lambda: fman.ConfigFile(path), repeat)))
+    results.append(harness.summarize("ConfigFile parse", harness.measure(lambda: fman.ConfigFile(path, contents), repeat)))
+
+    config = fman.ConfigFile(path)
+    present = next(line for line in config.lines if line.startswith("SCB_GAMESCOPE_ARGS="))
+    lookups = 1000
+    results.append(harness.summarize(
+        "check_for_exact_line (found)",
+        harness.measure(lambda: config.check_for_exact_line(present), repeat, number=lookups),
+        calls_per_run=lookups
+    ))
+    results.append(harness.summarize(
+        "check_for_exact_line (missing)",
+        harness.measure(lambda: config.check_for_exact_line("SCB_NOT_SET=1"), repeat, number=lookups),
+        calls_per_run=lookups
+    ))
+
+    for where, make_config in (
+        ("disk", lambda: fman.ConfigFile(path)),
+        ("memory", lambda: fman.ConfigFile(path, contents))
+    ):
+        for name, edit in edit_benchmarks(make_config()):
+            results.append(harness.summarize(f"{name} ({where})", harness.measure(edit, repeat)))
+
+    return results
+
+
+def edit_benchmarks(config) -> list[tuple[str, object]]:
+    """Returns (name, edit) for each edit method. Each call of an edit undoes the previous one."""
+    exports = [line[7:].strip() for line in config.lines if line.startswith("export ")]
+    export_states = [exports, exports[1:]] # re-enables, then comments out, the first export
+    gamescope_states = [("-W 1280 -H 800 -r 60 -f", True), ("-W 2560 -H 1440 -r 120", False)]
+    launch_states = ["-novid -skipintro", "-windowed"]
+    calls = {'exports': 0, 'gamescope': 0, 'exact': 0, 'launch': 0}
+
+    def next_state(kind:str, states:list):
+        calls[kind] += 1
+        return states[calls[kind] % len(states)]
+
+    def edit_exact_lines():
+        if config.check_for_exact_line("SCB_AUTO_HDR=1"):
+            config.edit_exact_lines(["SCB_AUTO_HDR=1"], ["SCB_AUTO_HDR=0"])
+        else:
+            config.edit_exact_lines(["SCB_AUTO_HDR=0"], ["SCB_AUTO_HDR=1"])
+
+    return [
+        ("edit_export_lines", lambda: config.edit_export_lines(next_state('exports', export_states))),
+        ("edit_gamescope_line", lambda: config.edit_gamescope_line(*next_state('gamescope', gamescope_states))),
+        ("edit_exact_lines", edit_exact_lines),
+        ("edit_launch_options", lambda: config.edit_launch_options(next_state('launch', launch_states)))
+    ]
+
+
+def scan_benchmarks(fman, directory_index, cache_dir:str, repeat:int) -> list[dict]:
+    """Every scan but the warm one starts with an empty fman.config_cache, as on the first start of the app,
+    so configs parsed by earlier runs are parsed again."""
+    def uncached_scan(scan_workers:int):
+        fman.config_cache.clear()
+        fman.ScopebuddyDirectory(scan_workers=scan_workers)
+
+    results = [
+        harness.summarize("ScopebuddyDirectory scan (1 worker)", harness.measure(lambda: uncached_scan(1), repeat)),
+        harness.summarize(
+            f"ScopebuddyDirectory scan ({THREADED_WORKERS} workers)",
+            harness.measure(lambda: uncached_scan(THREADED_WORKERS), repeat)
+        )
+    ]
+
+    index_path = os.path.join(cache_dir, "bench_index.json")
+
+    def cold_scan():
+        if os.path.exists(index_path):
+            os.remove(index_path)
+        fman.config_cache.clear()
+        fman.ScopebuddyDirectory(index=directory_index.DirectoryIndex(index_path))
+
+    def warm_scan():
+        fman.ScopebuddyDirectory(index=directory_index.DirectoryIndex(index_path))
+
+    results.append(harness.summarize("DirectoryIndex scan (cold)", harness.measure(cold_scan, repeat)))
+    cold_scan()
+    results.append(harness.summarize("DirectoryIndex scan (warm)", harness.measure(warm_scan, repeat)))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks reading, editing and scanning scopebuddy configs.")
+    parser.add_argument("-n", "--launchers", type=int, default=20)
+    parser.add_argument("-m", "--configs", type=int, default=25)
+    parser.add_argument("-k", "--lines", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=200, help="timed runs of each config benchmark")
+    parser.add_argument("--scan-repeat", type=int, default=10, help="timed runs of each scan benchmark")
+    parser.add_argument("-o", "--output", help="JSON file to write, stdout if not given")
+    arguments = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="scb-bench-")
+    try:
+        config_home = os.path.join(work_dir, "config")
+        cache_dir = os.path.join(work_dir, "cache")
+        os.environ["XDG_CONFIG_HOME"] = config_home
+        os.environ["XDG_CACHE_HOME"] = cache_dir
+        tree = synthetic_tree.build_tree(config_home, arguments.launchers, arguments.configs, arguments.lines, arguments.seed)
+
+        harness.use_source()
+        import file_manager as fman
+        import directory_index
+
+        # scan first, the config benchmarks edit a config
+        results = scan_benchmarks(fman, directory_index, cache_dir, arguments.scan_repeat)
+        launcher = os.path.join(tree['appid_dir'], "launcher000")
+        sample = os.path.join(launcher, sorted(os.listdir(launcher))[0]) if arguments.launchers else os.path.join(tree['scb_dir'], "scb.conf")
+        results += config_benchmarks(fman, sample, arguments.repeat)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    harness.print_table(results)
+    parameters = {key: value for key, value in tree.items() if key not in ('config_home', 'scb_dir', 'appid_dir')}
+    parameters.update(repeat=arguments.repeat, scan_repeat=arguments.scan_repeat)
+    harness.write_results("io", parameters, results, arguments.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+#
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2024-2025 Robert French (rfrench3, TealMango)
+
+'''
+Benchmarks startup: how long the app takes from launch until the window is painted and the file tree is complete.
+Each run starts the app in a new Python process (headless, QT_QPA_PLATFORM=offscreen unless another platform is set),
+against synthetic scopebuddy directories of increasing size (see synthetic_tree.py).
+
+Each run is split into phases, in order:
+- interpreter: from starting the process until its first line of Python runs
+- import main: importing src/main.py, which imports PySide6 and the modules it needs at startup
+- QApplication, MainWindow, ApplicationLogic: creating each of them (ApplicationLogic starts the background scan)
+- first paint: from window.show() until the window is first painted
+- first launchers: from the first paint until the scan has shown its first launchers (0 if it already had)
+- tree populated: from then until the scan has finished and the file tree is complete
+- time to interactive: until the window is painted and the file tree is complete, all of the above
+- open config, every page: opening a config and showing each tab once, after startup (not part of the total)
+
+Every size is run with a cold directory index (none saved) and a warm one (saved by the run before, nothing changed).
+Import times come from python -X importtime, for PySide6, its submodules and the app's own modules.
+The editor page modules are only imported once their page is shown, through importlib, which -X importtime
+does not see, so they are imported and timed on their own after startup, before the open config phase.
+Times are read from one monotonic clock (time.perf_counter) in both processes, as on Linux.
+
+Usage: bench_startup.py [--sizes NxMxK,...] [--repeat runs] [-o results.json]
+Results are written as JSON (see harness.py), to stdout unless -o is given.
+'''
+
+import os, sys, json, time, shutil, tempfile, argparse, importlib, subprocess
+
+import harness
+import synthetic_tree
+
+PHASES: list[str] = [
+    "interpreter", "import main", "QApplication", "MainWindow", "ApplicationLogic",
+    "first paint", "first launchers", "tree populated"
+]
+
+# modules whose import time is reported (uic_ modules, the compiled forms, are added as they are found)
+REPORTED_MODULES: list[str] = [
+    "shiboken6", "PySide6", "PySide6.QtCore", "PySide6.QtGui", "PySide6.QtWidgets", "PySide6.QtSvg", "PySide6.QtUiTools",
+    "main", "file_manager", "directory_index", "directory_scanner", "file_watcher", "file_tree_model",
+    "search_index", "settings_index", "shared_data",
+    "general_settings", "env_var", "env_var_model", "gamescope", "launch_options"
+]
+
+
+def child() -> None:
+    """Runs in the benchmarked process: starts the app, and prints the time each phase ended as JSON."""
+    marks = {'start': time.perf_counter()}
+
+    harness.use_source()
+    import main as app_main
+    marks['import main'] = time.perf_counter()
+
+    from PySide6.QtCore import QObject, QEvent, QTimer
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication([])
+    marks['QApplication'] = time.perf_counter()
+    window = app_main.MainWindow()
+    marks['MainWindow'] = time.perf_counter()
+    logic = app_main.ApplicationLogic(window.ui_widget)
+    window.logic = logic
+    marks['ApplicationLogic'] = time.perf_counter()
+
+    def quit_when_ready() -> None:
+        if 'first paint' in marks and 'tree populated' in marks:
+            QTimer.singleShot(0, app.quit)
+
+    class FirstPaint(QObject):
+        def eventFilter(self, watched, event) -> bool:
+            if event.type() == QEvent.Type.Paint and 'first paint' not in marks:
+                marks['first paint'] = time.perf_counter()
+                quit_when_ready()
+            return False
+
+    def launchers_found(_) -> None:
+        marks.setdefault('first launchers', time.perf_counter())
+
+    def scan_finished(_) -> None:
+        # connected after ApplicationLogic.scan_finished, so the tree is complete by now
+        marks['tree populated'] = time.perf_counter()
+        quit_when_ready()
+
+    paint_filter = FirstPaint()
+    window.ui_widget.installEventFilter(paint_filter)
+    logic.directory_scanner.launchers_found.connect(launchers_found)
+    logic.directory_scanner.finished.connect(scan_finished)
+    QTimer.singleShot(120000, app.quit) # a scan that never ends is reported as missing phases, rather than hanging
+
+    window.show()
+    app.exec()
+
+    # after startup: the editor page modules, then opening a config and showing every page, which builds them
+    marks['imports'] = {}
+    for page in app_main.EDITOR_PAGES:
+        module_name = page[2].rsplit('.', 1)[0]
+        start = time.perf_counter()
+        importlib.import_module(module_name)
+        marks['imports'][module_name] = time.perf_counter() - start
+
+    model = logic.file_tree_model
+    for row in range(model.rowCount()):
+        launcher = model.index(row, 0)
+        while model.canFetchMore(launcher):
+            model.fetchMore(launcher)
+        if model.rowCount(launcher):
+            start = time.perf_counter()
+            logic.open_config(model.path(model.index(0, 0, launcher)))
+            for page in range(1, logic.mainFileEdit.count()):
+                logic.mainFileEdit.setCurrentIndex(page)
+            app.processEvents()
+            marks['open config, every page'] = time.perf_counter() - start
+            break
+
+    print(json.dumps(marks))
+
+
+def parse_importtime(stderr:str) -> dict[str, dict]:
+    """Returns {module: {self, cumulative}} in ms, from the output of python -X importtime."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split('|')
+            self_us, cumulative_us = int(self_us), int(cumulative_us)
+        except ValueError:
+            continue # the header line
+        modules[name.strip()] = {'self': self_us / 1000, 'cumulative': cumulative_us / 1000}
+    return modules
+
+
+def run_once(environment:dict) -> tuple[dict, dict]:
+    """Starts the app in a new process. Returns the duration of each phase and the import times, in ms."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", os.path.abspath(__file__), "--child"],
+        env=environment, capture_output=True, text=True, timeout=300
+    )
+    if result.returncode != 0:
+        print(result.stderr[-4000:], file=sys.stderr)
+        raise RuntimeError(f"the app exited with {result.returncode}")
+    marks = json.loads(result.stdout.strip().splitlines()[-1])
+
+    # a phase that ended before the one listed ahead of it (the scan can show launchers before the first paint)
+    # is reported as 0, and the next phase starts from the later of the two
+    phases = {}
+    previous = start
+    for phase, mark in zip(PHASES, ['start', *PHASES[1:]]):
+        if mark not in marks:
+            continue
+        phases[phase] = max(marks[mark] - previous, 0.0) * 1000
+        previous = max(previous, marks[mark])
+    if 'tree populated' in marks and 'first paint' in marks:
+        phases['time to interactive'] = (max(marks['tree populated'], marks['first paint']) - start) * 1000
+    if 'open config, every page' in marks:
+        phases['open config, every page'] = marks['open config, every page'] * 1000
+
+    modules = parse_importtime(result.stderr)
+    for module, seconds in marks.get('imports', {}).items():
+        modules.setdefault(module, {'self': None, 'cumulative': seconds * 1000})
+    return phases, modules
+
+
+def summarize_runs(details:dict, phase_runs:dict[str, list[float]], import_runs:dict[str, list[dict]]) -> list[dict]:
+    """Returns the result entries of one size and index state: every phase, then every module, slowest import first.
+    Imports are reported by their cumulative time (with the modules they import), self_median is without them."""
+    prefix = f"{details['size']} {details['index']}"
+    results = [
+        harness.summarize(f"{prefix}: {phase}", phase_runs[phase], kind='phase', phase=phase, **details)
+        for phase in [*PHASES, "time to interactive", "open config, every page"]
+        if phase in phase_runs
+    ]
+
+    for module in sorted(import_runs, key=lambda name: -max(times['cumulative'] for times in import_runs[name])):
+        runs = import_runs[module]
+        self_times = sorted(times['self'] for times in runs if times['self'] is not None)
+        results.append(harness.summarize(
+            f"{prefix}: import {module}",
+            [times['cumulative'] / 1000 for times in runs],
+            kind='import', module=module,
+            self_median=harness.percentile(self_times, 0.5) if self_times else None,
+            **details
+        ))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks the startup of the app against directories of increasing size.")
+    parser.add_argument("--sizes", default="1x10x40,20x25x40,100x50x40",
+                        help="comma separated launchers x configs x lines of each directory (see synthetic_tree.py)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs of each size, for each index state")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="JSON file to write, stdout if not given")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+
+    if arguments.child:
+        child()
+        return
+
+    sizes = [tuple(int(number) for number in size.split('x')) for size in arguments.sizes.split(',')]
+    results = []
+    work_dir = tempfile.mkdtemp(prefix="scb-bench-")
+    try:
+        for launchers, configs, lines in sizes:
+            size_dir = os.path.join(work_dir, f"{launchers}x{configs}x{lines}")
+            config_home = os.path.join(size_dir, "config")
+            cache_dir = os.path.join(size_dir, "cache")
+            tree = synthetic_tree.build_tree(config_home, launchers, configs, lines, arguments.seed)
+
+            environment = dict(os.environ)
+            environment.setdefault("QT_QPA_PLATFORM", "offscreen")
+            environment.update(XDG_CONFIG_HOME=config_home, XDG_CACHE_HOME=cache_dir)
+
+            for index_state in ("cold", "warm"):
+                phase_runs: dict[str, list[float]] = {}
+                import_runs: dict[str, list[dict]] = {}
+                for _ in range(arguments.repeat):
+                    if index_state == "cold":
+                        shutil.rmtree(cache_dir, ignore_errors=True)
+                    elif not os.path.exists(cache_dir):
+                        run_once(environment) # saves the index the warm runs start from
+                    phases, modules = run_once(environment)
+                    for phase, milliseconds in phases.items():
+                        phase_runs.setdefault(phase, []).append(milliseconds / 1000)
+                    for module, times in modules.items():
+                        if module in REPORTED_MODULES or module.startswith("uic_"):
+                            import_runs.setdefault(module, []).append(times)
+
+                details = {'size': f"{launchers}x{configs}x{lines}", 'config_files': tree['config_files'], 'index': index_state}
+                results += summarize_runs(details, phase_runs, import_runs)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    harness.print_table([result for result in results if result['kind'] == 'phase'])
+    harness.write_results("startup", {'sizes': arguments.sizes, 'repeat': arguments.repeat, 'seed': arguments.seed}, results, arguments.output)
+
+
+if __name__ == "__main__":
+    main()
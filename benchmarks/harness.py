@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+#
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2024-2025 Robert French (rfrench3, TealMango)
+
+'''
+What the benchmarks share: timing, percentiles and the JSON they write.
+
+Every benchmark writes one JSON document:
+    {"suite": name, "environment": {...}, "parameters": {...}, "results": [{"name": ..., "unit": "ms", ...stats}, ...]}
+so runs from different commits or machines can be compared with any JSON tool.
+'''
+
+import os, sys, json, time, platform, subprocess
+from datetime import datetime, timezone
+
+REPO_DIR:str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR:str = os.path.join(REPO_DIR, "src")
+
+
+def use_source() -> None:
+    """Makes the modules in src/ importable. XDG_CONFIG_HOME has to be set before file_manager is imported,
+    because the scopebuddy paths are read from it once, at import."""
+    if SRC_DIR not in sys.path:
+        sys.path.insert(0, SRC_DIR)
+
+
+def percentile(sorted_values:list[float], fraction:float) -> float:
+    """Returns the value below which fraction of sorted_values fall, interpolating between neighbours."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarize(name:str, seconds:list[float], **details) -> dict:
+    """Returns the result entry for a list of timings in seconds, reported in milliseconds."""
+    values = sorted(value * 1000 for value in seconds)
+    return {
+        'name': name,
+        'unit': 'ms',
+        'runs': len(values),
+        'min': values[0] if values else 0.0,
+        'median': percentile(values, 0.5),
+        'mean': sum(values) / len(values) if values else 0.0,
+        'p90': percentile(values, 0.9),
+        'p95': percentile(values, 0.95),
+        'p99': percentile(values, 0.99),
+        'max': values[-1] if values else 0.0,
+        **details
+    }
+
+
+def measure(function, repeat:int, number:int=1, warmup:int=1) -> list[float]:
+    """Calls function warmup times untimed, then times repeat runs of number calls each.
+    Returns the time of one call in each run, in seconds (number > 1 is for calls too quick to time one at a time)."""
+    for _ in range(warmup):
+        function()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter() - start) / number)
+    return timings
+
+
+def git_commit() -> str | None:
+    try:
+        result = subprocess.run(["git", "-C", REPO_DIR, "rev-parse", "HEAD"], capture_output=True, text=True, timeout=10)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def environment() -> dict:
+    """Describes where the benchmark ran, so results are only compared with comparable ones."""
+    try:
+        from PySide6 import __version__ as pyside_version
+    except ImportError:
+        pyside_version = None
+    return {
+        'time': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'pyside6': pyside_version,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count()
+    }
+
+
+def write_results(suite:str, parameters:dict, results:list[dict], output:str|None=None) -> dict:
+    """Writes the JSON document of a benchmark run to output (stdout if None or -), and returns it."""
+    document = {
+        'suite': suite,
+        'environment': environment(),
+        'parameters': parameters,
+        'results': results
+    }
+    text = json.dumps(document, indent=2)
+    if output is None or output == '-':
+        print(text)
+    else:
+        with open(output, 'w') as file:
+            file.write(text + '\n')
+        print(f"{suite}: {len(results)} results written to {output}", file=sys.stderr)
+    return document
+
+
+def print_table(results:list[dict]) -> None:
+    """Prints results as a readable table on stderr, so it does not mix with JSON on stdout."""
+    width = max((len(result['name']) for result in results), default=4)
+    print(f"{'name':<{width}}  {'median':>10}  {'p95':>10}  {'max':>10}  runs", file=sys.stderr)
+    for result in results:
+        print(
+            f"{result['name']:<{width}}  {result['median']:>10.4f}  {result['p95']:>10.4f}  {result['max']:>10.4f}  {result['runs']}",
+            file=sys.stderr
+        )
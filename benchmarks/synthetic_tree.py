@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+#
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2024-2025 Robert French (rfrench3, TealMango)
+
+'''
+Builds a fake scopebuddy directory for the benchmarks, laid out the way scopebuddy and the app expect it:
+
+    <config home>/scopebuddy/scb.conf
+    <config home>/scopebuddy/AppID/<appid>.conf              (Steam configs, M of them)
+    <config home>/scopebuddy/AppID/steam -> .                (the symlink create_directory makes)
+    <config home>/scopebuddy/AppID/launcher<n>/<appid>.conf  (N launchers with M configs each)
+
+Every config has K lines: the display name, then a mix of exports, SCB_ settings, a gamescope line, launch options
+and comments, so parsing and editing them does the same work as on a real config. The same arguments and seed
+always build the same tree.
+
+Usage: synthetic_tree.py config_home [-n launchers] [-m configs] [-k lines] [--seed seed]
+The benchmarks point XDG_CONFIG_HOME at config_home.
+'''
+
+import os, sys, random, argparse
+
+GAMESCOPE_ARGUMENTS: list[str] = [
+    "-W 2560 -H 1440", "-w 1920 -h 1080", "-r 120", "-r 60", "-f", "-b", "--hdr-enabled",
+    "--adaptive-sync", "--mangoapp", "-F fsr", "--force-grab-cursor", "-e"
+]
+ENVIRONMENT_VARIABLES: list[str] = [
+    "DXVK_ASYNC=1", "PROTON_ENABLE_NVAPI=1", "MANGOHUD=1", "PROTON_USE_WINED3D=0", "WINEDLLOVERRIDES=dxgi=n,b",
+    "VKD3D_CONFIG=dxr", "ENABLE_GAMESCOPE_WSI=1", "DXVK_HUD=fps", "MESA_SHADER_CACHE_MAX_SIZE=4G", "SDL_VIDEODRIVER=x11"
+]
+SCB_SETTINGS: list[str] = ["SCB_AUTO_RES=1", "SCB_AUTO_HDR=1", "SCB_AUTO_VRR=1", "SCB_NOSCOPE=1", "SCB_DEBUG=1"]
+LAUNCH_OPTIONS: list[str] = ["-novid", "-windowed", "-dx11", "-skipintro", "-fullscreen"]
+
+
+def config_lines(displayname:str, lines:int, rng:random.Random) -> list[str]:
+    """Returns the lines of one config: the display name, then lines - 1 lines of settings and comments."""
+    body = [
+        f'SCB_GAMESCOPE_ARGS="{" ".join(rng.sample(GAMESCOPE_ARGUMENTS, 4))}"\n',
+        f"command+=' {' '.join(rng.sample(LAUNCH_OPTIONS, 2))}'\n"
+    ]
+    while len(body) < lines - 1:
+        kind = rng.random()
+        if kind < 0.45:
+            variable = rng.choice(ENVIRONMENT_VARIABLES)
+            body.append(f"export {variable}\n" if rng.random() < 0.8 else f"#export {variable}\n")
+        elif kind < 0.6:
+            body.append(f"{rng.choice(SCB_SETTINGS)}\n")
+        else:
+            body.append(f"# note {len(body)}: {rng.choice(GAMESCOPE_ARGUMENTS)}\n")
+    rng.shuffle(body)
+    return [f"# {displayname}\n", *body[:max(lines - 1, 0)]]
+
+
+def write_config(path:str, displayname:str, lines:int, rng:random.Random) -> None:
+    with open(path, 'w') as file:
+        file.writelines(config_lines(displayname, lines, rng))
+
+
+def build_tree(config_home:str, launchers:int=20, configs:int=25, lines:int=40, seed:int=0) -> dict:
+    """Builds the tree inside config_home (which is created if needed, and should be empty).
+    Returns a description of what was built: its paths, size and the path of one config of each kind."""
+    rng = random.Random(seed)
+    scb_dir = os.path.join(config_home, "scopebuddy")
+    appid_dir = os.path.join(scb_dir, "AppID")
+    os.makedirs(appid_dir, exist_ok=True)
+
+    write_config(os.path.join(scb_dir, "scb.conf"), "Global Config file.", lines, rng)
+    os.symlink(".", os.path.join(appid_dir, "steam"), target_is_directory=True)
+
+    appid = 100000
+    for number in range(configs):
+        appid += rng.randint(1, 5000)
+        write_config(os.path.join(appid_dir, f"{appid}.conf"), f"Steam Game {number}", lines, rng)
+
+    for launcher in range(launchers):
+        folder = os.path.join(appid_dir, f"launcher{launcher:03d}")
+        os.mkdir(folder)
+        for number in range(configs):
+            appid += rng.randint(1, 5000)
+            write_config(os.path.join(folder, f"{appid}.conf"), f"Game {launcher}-{number}", lines, rng)
+
+    return {
+        'config_home': config_home,
+        'scb_dir': scb_dir,
+        'appid_dir': appid_dir,
+        'launchers': launchers,
+        'configs_per_launcher': configs,
+        'lines_per_config': lines,
+        'seed': seed,
+        'config_files': 1 + configs * (launchers + 1)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Builds a fake scopebuddy directory for the benchmarks.")
+    parser.add_argument("config_home", help="folder to build <config home>/scopebuddy in")
+    parser.add_argument("-n", "--launchers", type=int, default=20, help="launcher folders inside AppID")
+    parser.add_argument("-m", "--configs", type=int, default=25, help="configs in each launcher, and directly in AppID")
+    parser.add_argument("-k", "--lines", type=int, default=40, help="lines in each config")
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+
+    if os.path.exists(os.path.join(arguments.config_home, "scopebuddy")):
+        print(f"{arguments.config_home} already has a scopebuddy folder")
+        sys.exit(1)
+
+    tree = build_tree(arguments.config_home, arguments.launchers, arguments.configs, arguments.lines, arguments.seed)
+    print(f"{tree['config_files']} configs in {tree['scb_dir']}")
+
+
+if __name__ == "__main__":
+    main()
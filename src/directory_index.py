@@ -0,0 +1,278 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2024-2025 Robert French (rfrench3, TealMango)
+
+import os, json
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
+
+import file_manager as fman
+import tracing
+
+# cache files
+CACHE_DIR:str = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "scopebuddy-gui") #folder
+INDEX_PATH:str = os.path.join(CACHE_DIR, "directory_index.json") #file
+
+# bump whenever the stored format changes, older indexes are then rebuilt from scratch
+INDEX_VERSION:int = 1
+
+'''
+The DirectoryIndex class:
+PURPOSE: remember what the scopebuddy directory looked like between runs, so startup only reparses what changed.
+STORED: for every folder, its mtime and listing. For every file, its mtime, size, inode, display name and parsed summary.
+A folder is only listed again if its mtime changed. A config is only parsed again if its stat signature changed,
+files are still stat'ed because editing a file in place does not change the mtime of its folder.
+Folders reached again through a symlink (AppID/steam) are not listed again, so their configs are only indexed once,
+under the path of the folder they lead to (see aliases).
+Only one thread refreshes the index at a time (see iter_refresh).
+'''
+class DirectoryIndex:
+    def __init__(self, index_path:str=INDEX_PATH) -> None:
+        self.index_path: str = index_path
+        self.folders: dict[str, dict] = {} # path: {mtime, entries: [[name, 'file'/'folder', is_symlink], ...]}
+        self.files: dict[str, dict] = {} # path: {mtime, size, inode, displayname, summary}
+        self.aliases: dict[str, str] = {} # folders reached again through a symlink, see fman.FolderVisits
+        self.lock = Lock()
+        self.loaded: bool = False # read from disk on the first refresh, so it happens on the scanning thread
+
+    @tracing.traced("DirectoryIndex.load", "scan")
+    def load(self) -> None:
+        """Loads the index from disk. A missing, unreadable or outdated index is treated as empty."""
+        self.loaded = True
+        try:
+            with open(self.index_path, 'r') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+
+        if not isinstance(data, dict) or data.get('version') != INDEX_VERSION or data.get('root') != fman.SCB_DIR:
+            return
+
+        self.folders = data.get('folders', {})
+        self.files = data.get('files', {})
+
+    @tracing.traced("DirectoryIndex.save", "scan")
+    def save(self) -> None:
+        """Writes the index to disk. The old index is only replaced once the new one is fully written."""
+        data = {
+            'version': INDEX_VERSION,
+            'root': fman.SCB_DIR,
+            'folders': self.folders,
+            'files': self.files
+        }
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            temporary_path = f"{self.index_path}.tmp"
+            with open(temporary_path, 'w') as file:
+                json.dump(data, file, separators=(',', ':'))
+            os.replace(temporary_path, self.index_path)
+        except OSError as e:
+            print(f"Unable to save the directory index: {e}")
+
+    def refresh(self, directory:fman.ScopebuddyDirectory) -> dict:
+        """Brings the index up to date with the scopebuddy directory, saving it if anything changed.
+        Returns the directory in the format of ScopebuddyDirectory.return_filesystem_information."""
+        information = {}
+        for _ in self.iter_refresh(directory, information):
+            pass
+        return information
+
+    @tracing.traced("DirectoryIndex refresh", "scan")
+    def iter_refresh(self, directory:fman.ScopebuddyDirectory, information:dict, batch_size:int|None=None):
+        """Generator version of refresh that fills in information as it goes.
+        Each level of the tree is refreshed batch_size folders at a time (all at once if None),
+        yielding the folder items of every batch once their configs are indexed.
+        Entries that no longer exist are only forgotten, and the index saved, once it is exhausted.\n
+        The lock is held until it is exhausted, including while it waits at a yield, so only one thread may refresh
+        the index at a time: in the app, the scanner's worker thread. Anything else that uses the index
+        (update_folder, or another refresh) blocks until the scan is done, so the GUI thread waits for
+        DirectoryScanner.finished instead."""
+        with self.lock: # the index is refreshed from a worker thread
+            if not self.loaded:
+                self.load()
+            seen_folders: set[str] = set()
+            seen_files: set[str] = set()
+            self._changed = False
+
+            visits = fman.FolderVisits(directory.directory_path, information)
+            directory.aliases = self.aliases = visits.aliases
+            level: list[tuple[str, tuple[int, int], dict, dict | None]] = [(directory.directory_path, visits.root, information, None)]
+
+            while level:
+                next_level = []
+                step = batch_size or len(level)
+                for start in range(0, len(level), step):
+                    batch = level[start:start + step]
+                    changed_configs: list[dict] = []
+
+                    for folder, identity, folder_information, _ in batch:
+                        seen_folders.add(folder)
+                        symlinked_subfolders: list[tuple[tuple[int, int], dict]] = []
+                        for name, entry_type, is_symlink in self._folder_listing(folder):
+                            path = os.path.join(folder, name)
+                            try:
+                                stat = os.stat(path)
+                            except OSError:
+                                continue # removed since the folder was listed
+
+                            if entry_type == 'file':
+                                item = {
+                                    'type': 'file',
+                                    'path': path,
+                                    'name': name,
+                                    'mtime': stat.st_mtime_ns,
+                                    'size': stat.st_size,
+                                    'inode': stat.st_ino
+                                }
+                                if name.endswith('.conf'):
+                                    seen_files.add(path)
+                                    indexed = self.files.get(path)
+                                    if indexed and (indexed['mtime'], indexed['size'], indexed['inode']) == fman.stat_signature(stat):
+                                        item['displayname'] = indexed['displayname']
+                                    else:
+                                        changed_configs.append(item)
+                                folder_information[name] = item
+
+                            else:
+                                item = {
+                                    'type': 'folder',
+                                    'path': path,
+                                    'name': name,
+                                    'mtime': stat.st_mtime_ns,
+                                    'inode': stat.st_ino,
+                                    'children': {}
+                                }
+                                folder_information[name] = item
+                                if is_symlink:
+                                    symlinked_subfolders.append(((stat.st_dev, stat.st_ino), item))
+                                else:
+                                    self._visit(visits, (stat.st_dev, stat.st_ino), item, next_level)
+
+                        # the same order as ScopebuddyDirectory.list_folder, symlinks last
+                        for subfolder, item in symlinked_subfolders:
+                            self._visit(visits, subfolder, item, next_level)
+                        visits.mark_listed(identity)
+
+                    self._parse_configs(changed_configs, directory.scan_workers)
+                    yield [item for *_, item in batch if item is not None] + visits.resolve()
+                level = next_level
+
+            # forget whatever no longer exists
+            for path in [path for path in self.folders if path not in seen_folders]:
+                del self.folders[path]
+                self._changed = True
+            for path in [path for path in self.files if path not in seen_files]:
+                del self.files[path]
+                self._changed = True
+
+            if self._changed:
+                self.save()
+
+    def update_folder(self, folder:str) -> None:
+        """Brings the configs directly inside one folder up to date after a change seen since the last refresh
+        (see DirectoryWatcher), without walking the rest of the tree. Only configs whose stat signature changed are parsed.
+        The change is kept in memory, the saved index is brought up to date by the next refresh."""
+        with self.lock:
+            if not os.path.isdir(folder):
+                self.folders.pop(folder, None)
+                entries = []
+            else:
+                entries = self._folder_listing(folder)
+
+            seen_files: set[str] = set()
+            changed_configs: list[dict] = []
+            for name, entry_type, _ in entries:
+                if entry_type != 'file' or not name.endswith('.conf'):
+                    continue
+                path = os.path.join(folder, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue # removed since the folder was listed
+                seen_files.add(path)
+                indexed = self.files.get(path)
+                if indexed and (indexed['mtime'], indexed['size'], indexed['inode']) == fman.stat_signature(stat):
+                    continue
+                changed_configs.append({
+                    'type': 'file',
+                    'path': path,
+                    'name': name,
+                    'mtime': stat.st_mtime_ns,
+                    'size': stat.st_size,
+                    'inode': stat.st_ino
+                })
+
+            for path in [path for path in self.files if os.path.dirname(path) == folder and path not in seen_files]:
+                del self.files[path]
+            self._parse_configs(changed_configs, 1)
+
+    @staticmethod
+    def _visit(visits:fman.FolderVisits, identity:tuple[int, int], item:dict, next_level:list) -> None:
+        """Queues a folder item to be listed on the next level, unless it is an alias of a folder already reached."""
+        if visits.visit(identity, item):
+            next_level.append((item['path'], identity, item['children'], item))
+
+    def _folder_listing(self, folder:str) -> list[list]:
+        """Returns the [name, type, is_symlink] of each file and folder inside the folder,
+        only listing it again if its mtime changed since it was indexed."""
+        try:
+            mtime = os.stat(folder).st_mtime_ns
+        except OSError as e:
+            print(f"Unable to list {folder} for the directory index: {e}")
+            raise
+
+        indexed = self.folders.get(folder)
+        if indexed and indexed['mtime'] == mtime:
+            return indexed['entries']
+
+        entries = []
+        with os.scandir(folder) as scanned:
+            for entry in scanned:
+                try:
+                    if entry.is_file():
+                        entries.append([entry.name, 'file', entry.is_symlink()])
+                    elif entry.is_dir():
+                        entries.append([entry.name, 'folder', entry.is_symlink()])
+                except OSError:
+                    continue # broken symlink
+
+        self.folders[folder] = {'mtime': mtime, 'entries': entries}
+        self._changed = True
+        return entries
+
+    def _parse_configs(self, items:list[dict], workers:int) -> None:
+        """Parses the configs that changed since they were indexed, and stores their display name and summary."""
+        if not items:
+            return
+
+        def parse(item:dict) -> dict | None:
+            try:
+                return fman.scan_summary(item['path'])
+            except Exception as e:
+                print(f"Unable to index {item['path']}: {e}")
+                return None
+
+        if workers <= 1:
+            summaries = list(map(parse, items))
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                summaries = list(executor.map(parse, items))
+
+        for item, summary in zip(items, summaries):
+            if summary is None:
+                # forget what it said before, so searches do not match settings it may no longer have
+                self.files.pop(item['path'], None)
+                item['displayname'] = item['name']
+                continue
+            item['displayname'] = summary['displayname']
+            self.files[item['path']] = {
+                'mtime': item['mtime'],
+                'size': item['size'],
+                'inode': item['inode'],
+                'displayname': summary['displayname'],
+                'summary': summary
+            }
+        self._changed = True
+
+    def summaries(self) -> dict[str, dict]:
+        """Returns the path: parsed summary of every indexed config."""
+        return {path: data['summary'] for path, data in self.files.items()}
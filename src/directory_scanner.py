@@ -0,0 +1,89 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2024-2025 Robert French (rfrench3, TealMango)
+
+import os
+from threading import Lock
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+import file_manager as fman
+
+'''
+The DirectoryScanner class:
+PURPOSE: scan the scopebuddy directory on a worker thread, so the window can be shown before the scan finishes.
+OUTPUT: launchers_found, emitted with each batch of launcher folder items as soon as they are scanned,
+and finished, emitted with the full directory (see ScopebuddyDirectory.return_filesystem_information).
+Only the most recently started scan reports anything, older scans that are still running are ignored.
+If it is given a SearchIndex, the scan brings it up to date with the configs it found before finished is emitted,
+so nothing else may use the search index while scanning is True.
+'''
+class DirectoryScanner(QObject):
+    launchers_found = Signal(object)
+    finished = Signal(object)
+
+    # emitted from the worker thread, and received on the thread the scanner lives on
+    _batch_scanned = Signal(int, object)
+    _scan_finished = Signal(int, object)
+
+    def __init__(self, parent=None, index=None, search_index=None) -> None:
+        super().__init__(parent)
+        self.index = index
+        self.search_index = search_index
+        self._search_index_lock = Lock() # an older scan may still be syncing it when a newer one finishes
+        self.scanning: bool = False
+        self._generation: int = 0
+
+        self._batch_scanned.connect(self._on_batch_scanned)
+        self._scan_finished.connect(self._on_scan_finished)
+
+    def start(self) -> None:
+        """Starts a new scan on the global thread pool."""
+        self._generation += 1
+        self.scanning = True
+        QThreadPool.globalInstance().start(_ScanTask(self, self._generation))
+
+    def _on_batch_scanned(self, generation:int, launchers:list) -> None:
+        if generation == self._generation:
+            self.launchers_found.emit(launchers)
+
+    def _on_scan_finished(self, generation:int, full_directory:dict) -> None:
+        if generation == self._generation:
+            self.scanning = False
+            self.finished.emit(full_directory)
+
+
+class _ScanTask(QRunnable):
+    def __init__(self, scanner:DirectoryScanner, generation:int) -> None:
+        super().__init__()
+        self.scanner = scanner
+        self.generation = generation
+
+    def run(self) -> None:
+        directory = fman.ScopebuddyDirectory(index=self.scanner.index, scan=False)
+        try:
+            for launchers in directory.scan_launchers():
+                self.scanner._batch_scanned.emit(self.generation, launchers)
+        except Exception as e:
+            print(f"Unable to scan the scopebuddy directory: {e}")
+
+        if self.scanner.search_index is not None:
+            with self.scanner._search_index_lock:
+                if self.generation == self.scanner._generation: # an outdated scan leaves it to the newer one
+                    try:
+                        self.scanner.search_index.sync(config_items(directory.full_directory))
+                    except Exception as e:
+                        print(f"Unable to update the search index: {e}")
+
+        # always report back, so the app does not keep waiting on a failed scan
+        self.scanner._scan_finished.emit(self.generation, directory.full_directory)
+
+
+def config_items(full_directory:dict) -> dict[str, dict]:
+    """Returns the path: file item of every config of every launcher in a scan result
+    (see ScopebuddyDirectory.return_filesystem_information), as FileTreeModel.config_items does for the file tree."""
+    launchers = full_directory.get(os.path.basename(fman.APPID_DIR), {}).get('children', {})
+    return {
+        os.path.join(fman.APPID_DIR, name, child['name']): child
+        for name, launcher in launchers.items() if launcher['type'] == 'folder'
+        for child in launcher['children'].values() if child['type'] == 'file'
+    }
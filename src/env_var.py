@@ -5,23 +5,37 @@ import sys
 import os
 sys.path.insert(0, "/app/share/scopebuddygui") # flatpak path
 
-from PySide6.QtWidgets import QToolButton, QLineEdit, QWidget, QDialogButtonBox, QMessageBox
+from PySide6.QtWidgets import QToolButton, QListView, QDialogButtonBox, QMessageBox, QAbstractItemView
+from PySide6.QtGui import QAction, QKeySequence
+from PySide6.QtCore import Qt
 import file_manager as fman
 from file_manager import ConfigFile
+from env_var_model import EnvVarModel, EnvVarDelegate
 import shared_data
-
-entry:str = fman.ui_env_vars_entry
+import tracing
 
 class EnvVarLogic:
+    @tracing.traced(category="logic", describe=lambda self, file, *_: {'path': file.path_to_file})
     def __init__(self, file:ConfigFile, parent_widget=None) -> None:
             self.initialized = False
 
             self.parent_logic = None  # Will be set by main.py
-            self.entries = []  # Store references to all entry widgets
-            self.file = file
-            self.env_vars_list = parent_widget.findChild(QWidget, 'additional_entries')  # type: ignore
+            self.file: ConfigFile | None = None
             self.parent_widget = parent_widget
 
+            # one row per variable, drawn and edited by a delegate instead of a widget per variable
+            self.model = EnvVarModel(parent_widget)
+            self.env_vars_list: QListView = parent_widget.findChild(QListView, 'variables_view')  # type: ignore
+            self.env_vars_list.setModel(self.model)
+            self.env_vars_list.setItemDelegate(EnvVarDelegate(self.env_vars_list))
+
+            self.delete_action = QAction("Delete Variable", self.env_vars_list)
+            self.delete_action.setShortcut(QKeySequence.StandardKey.Delete)
+            self.delete_action.setShortcutContext(Qt.ShortcutContext.WidgetShortcut)
+            self.delete_action.triggered.connect(self.delete_selected_entry)
+            self.env_vars_list.addAction(self.delete_action)
+            self.env_vars_list.setContextMenuPolicy(Qt.ContextMenuPolicy.ActionsContextMenu)
+
             # Initialize and connect inputs
             self.add_entry = parent_widget.findChild(QToolButton, 'add_entry')  # type: ignore
             self.button_box = parent_widget.findChild(QDialogButtonBox, 'buttonBox')  # type: ignore
@@ -31,23 +45,36 @@ class EnvVarLogic:
             self.reset_button = self.button_box.button(QDialogButtonBox.StandardButton.Reset) # type: ignore
             self.defaults_button = self.button_box.button(QDialogButtonBox.StandardButton.RestoreDefaults) # type: ignore
             
-            self.add_entry.clicked.connect(self.new_entry)
+            self.add_entry.clicked.connect(lambda: self.new_entry())
             self.apply_button.clicked.connect(self.save_data)
             self.help_button.clicked.connect(lambda: os.system("xdg-open https://rfrench3.github.io/scopebuddy-gui/#environment_variables"))
 
-            # Load lines from the file
-            
-            self.load_data()
-            
+            self.model.dataChanged.connect(self.data_changed)
+            self.model.rowsRemoved.connect(self.data_changed)
 
-            # Start the field with one blank entry
-            self.new_entry()
+            self.bind(file)
 
-            # checks against saved_data should only begin once everything is initialized
-            self.saved_data:list[str] = self.file.print_export_lines()
+    @tracing.traced(category="logic", describe=lambda self, file, *_: {'path': file.path_to_file})
+    def bind(self, file:ConfigFile) -> None:
+        """Shows a file on this page, replacing whatever it showed before. The widgets are reused, only their values change."""
+        self.initialized = False
+        self.file = file
 
-            self.apply_button.setEnabled(False)
-            self.initialized = True
+        # Load lines from the file, and start the field with one blank entry
+        self.load_data()
+
+        # checks against saved_data should only begin once everything is initialized
+        self.saved_data:list[str] = self.file.print_export_lines()
+
+        self.apply_button.setEnabled(False)
+        self.initialized = True
+
+    def unbind(self) -> None:
+        """Detaches the page from its file, dropping unsaved input. The page is kept to be bound to the next file."""
+        self.initialized = False
+        self.file = None
+        self.model.set_variables([])
+        self.apply_button.setEnabled(False)
 
     def data_changed(self) -> None:
         """When the user has inputted data, compare it to the saved data
@@ -69,9 +96,9 @@ class EnvVarLogic:
         """Loads the data from the file into the UI elements."""
         variables_list:list[str] = self.file.print_export_lines()
 
-        for entry in variables_list:
-            self.new_entry(entry)
+        self.model.set_variables(variables_list + [''])
 
+    @tracing.traced(category="logic", describe=lambda self: {'path': getattr(self.file, 'path_to_file', None)})
     def save_data(self) -> bool:
         """Load data into a list and apply it to the file."""
         data:list[str] = self.return_env_vars_list()
@@ -108,67 +135,35 @@ class EnvVarLogic:
             if result != QMessageBox.StandardButton.Ignore:
                 return True
             
-        self.apply_button.setEnabled(False)
-
-        self.file.edit_export_lines(data)
+        with self.file.transaction():
+            self.file.edit_export_lines(data)
+        self.file.on_commit(self.mark_saved)
+        return False
 
+    def mark_saved(self) -> None:
+        """Remembers the saved variables, once they are written to the file."""
+        self.apply_button.setEnabled(False)
         self.saved_data:list[str] = self.file.print_export_lines()
         shared_data.unsaved_changes = False
-        return False
 
 
     def new_entry(self, data:str|None = None) -> None:
-        """Creates a new entry in the environment variables list."""
-        new_entry = fman.load_widget(entry)
-        layout = self.env_vars_list.layout()
-        layout.addWidget(new_entry)
-        
-        # Find and store references to the widgets
-        variable_line = new_entry.findChild(QLineEdit, 'variable_line')
-        delete_entry = new_entry.findChild(QToolButton, 'delete_entry')
-
-        variable_line.textChanged.connect(self.data_changed) #type:ignore
-        #delete_entry.clicked.connect(self.data_changed) #type:ignore
-        
-        # Put file's variables into entry
-        if data:
-            variable_line.setText(data) # type: ignore
-
-        # Store the entry data for later access
-        entry_data = {
-            'widget': new_entry,
-            'variable_line': variable_line,
-            'delete_entry': delete_entry
-        }
-        self.entries.append(entry_data)
-        
-        # Connect the delete button to remove this entry
-        if delete_entry:
-            delete_entry.clicked.connect(lambda: self.remove_entry(entry_data))
-    
-    def remove_entry(self, entry_data) -> None:
-        """Remove an entry from the list."""
-
-        layout = self.env_vars_list.layout()
-        layout.removeWidget(entry_data['widget'])
-        
-        # Delete the widget
-        entry_data['widget'].deleteLater() # prevent memory leak
-        
-        # Remove from our list
-        self.entries.remove(entry_data)
-        self.data_changed()
+        """Creates a new entry in the environment variables list, and starts editing it."""
+        index = self.model.append_variable(data or '')
+        self.env_vars_list.setCurrentIndex(index)
+        self.env_vars_list.scrollTo(index)
+        if self.env_vars_list.state() != QAbstractItemView.State.EditingState: # the CurrentChanged edit trigger may have opened it
+            self.env_vars_list.edit(index)
+
+    def delete_selected_entry(self) -> None:
+        """Remove the selected entry from the list."""
+        index = self.env_vars_list.currentIndex()
+        if index.isValid():
+            self.model.removeRow(index.row())
 
     def return_env_vars_list(self) -> list[str]:
         """Outputs a list of environment variables input by the user.
         Ignores entries that are blank, and strips beginning/ending spaces."""
-        vars_list = []
-
-        for entry_data in self.entries:
-            variable_line = entry_data['variable_line']
-            if variable_line and variable_line.text().strip():  # Only include non-empty entries
-                vars_list.append(variable_line.text().strip())
-
-        return vars_list
+        return self.model.variables()
     
     
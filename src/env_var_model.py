@@ -0,0 +1,144 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2024-2025 Robert French (rfrench3, TealMango)
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QRect, QSize, Qt, QEvent
+from PySide6.QtGui import QIcon, QPalette
+from PySide6.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem, QStyle, QLineEdit, QApplication
+
+# height of a variable's row, and width of its delete button
+ROW_HEIGHT: int = 36
+
+
+'''
+The EnvVarModel class:
+PURPOSE: hold the environment variables of the environment variables page as one list of strings,
+so the page can show thousands of them without a widget for each.
+OUTPUT: one editable row per variable (NAME=value, without export), see variables for what gets saved.
+ALTER: set_variables, append_variable, setData (editing a row) and removeRows (deleting rows).
+'''
+class EnvVarModel(QAbstractListModel):
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.rows: list[str] = []
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return self.rows[index.row()]
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole or self.rows[index.row()] == value:
+            return False
+        self.rows[index.row()] = value
+        self.dataChanged.emit(index, index)
+        return True
+
+    def flags(self, index) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEditable
+
+    def removeRows(self, row:int, count:int, parent=QModelIndex()) -> bool:
+        if parent.isValid() or count < 1 or row < 0 or row + count > len(self.rows):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        del self.rows[row:row + count]
+        self.endRemoveRows()
+        return True
+
+    def set_variables(self, variables:list[str]) -> None:
+        """Replaces every row."""
+        self.beginResetModel()
+        self.rows = list(variables)
+        self.endResetModel()
+
+    def append_variable(self, variable:str='') -> QModelIndex:
+        """Adds a row at the end, returns its index."""
+        self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows))
+        self.rows.append(variable)
+        self.endInsertRows()
+        return self.index(len(self.rows) - 1, 0)
+
+    def variables(self) -> list[str]:
+        """Returns the variables to save: blank rows are left out, and beginning/ending spaces are stripped."""
+        return [row.strip() for row in self.rows if row.strip()]
+
+
+'''
+The EnvVarDelegate class:
+PURPOSE: draw and edit the rows of an EnvVarModel the way the environment variables page used to lay out a widget
+for each of them: "export", the variable, and a delete button.
+OUTPUT: a QLineEdit while a row is edited (committed as the user types, so the apply button follows along),
+and a painted delete button that removes its row when clicked.
+'''
+class EnvVarDelegate(QStyledItemDelegate):
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.delete_icon = QIcon.fromTheme(QIcon.ThemeIcon.ListRemove)
+
+    @staticmethod
+    def _areas(option:QStyleOptionViewItem) -> tuple[QRect, QRect, QRect]:
+        """Returns where "export", the variable and the delete button go within a row."""
+        rect = option.rect
+        prefix_width = option.fontMetrics.horizontalAdvance("export") + 8
+        prefix = QRect(rect.left() + 4, rect.top(), prefix_width, rect.height())
+        button = QRect(rect.right() - ROW_HEIGHT + 1, rect.top(), ROW_HEIGHT, rect.height())
+        text = QRect(prefix.right() + 1, rect.top(), button.left() - prefix.right() - 5, rect.height())
+        return prefix, text, button
+
+    def sizeHint(self, option, index) -> QSize:
+        return QSize(super().sizeHint(option, index).width(), ROW_HEIGHT)
+
+    def paint(self, painter, option, index) -> None:
+        option = QStyleOptionViewItem(option)
+        self.initStyleOption(option, index)
+        text = option.text
+        option.text = ''
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, option, painter, option.widget) # background, selection
+
+        prefix, text_area, button = self._areas(option)
+        selected = bool(option.state & QStyle.StateFlag.State_Selected)
+        painter.save()
+        painter.setPen(option.palette.color(QPalette.ColorRole.HighlightedText if selected else QPalette.ColorRole.Text))
+        painter.drawText(prefix, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, "export")
+        painter.drawText(
+            text_area,
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            option.fontMetrics.elidedText(text, Qt.TextElideMode.ElideRight, text_area.width())
+        )
+        if self.delete_icon.isNull():
+            painter.drawText(button, Qt.AlignmentFlag.AlignCenter, "⨯")
+        else:
+            self.delete_icon.paint(painter, button.adjusted(8, 8, -8, -8))
+        painter.restore()
+
+    def createEditor(self, parent, option, index) -> QLineEdit:
+        editor = QLineEdit(parent)
+        editor.setPlaceholderText("NAME=value")
+        editor.textEdited.connect(lambda: self.commitData.emit(editor))
+        return editor
+
+    def setEditorData(self, editor, index) -> None:
+        if editor.text() != index.data(Qt.ItemDataRole.EditRole):
+            editor.setText(index.data(Qt.ItemDataRole.EditRole))
+
+    def setModelData(self, editor, model, index) -> None:
+        model.setData(index, editor.text(), Qt.ItemDataRole.EditRole)
+
+    def updateEditorGeometry(self, editor, option, index) -> None:
+        _, text_area, _ = self._areas(option)
+        editor.setGeometry(text_area.adjusted(0, 4, 0, -4))
+
+    def editorEvent(self, event, model, option, index) -> bool:
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            _, _, button = self._areas(option)
+            if button.contains(event.position().toPoint()):
+                model.removeRow(index.row())
+                return True
+        return super().editorEvent(event, model, option, index)
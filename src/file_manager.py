@@ -1,17 +1,29 @@
 # SPDX-License-Identifier: GPL-3.0-only
 # SPDX-FileCopyrightText: 2024-2025 Robert French (rfrench3, TealMango)
 
-import os, shutil
+import os, shutil, importlib
+from io import StringIO
+from bisect import insort
+from collections import OrderedDict
+from threading import Lock
+from contextlib import contextmanager
+from functools import wraps, cache
+from difflib import SequenceMatcher
+from concurrent.futures import ThreadPoolExecutor
 from re import search
 
 # TODO: consider replacing os.path use with Path in the future, 
 # for now it's just here to validate filenames
 from pathlib import Path 
 
-from PySide6.QtGui import QIcon
-from PySide6.QtUiTools import QUiLoader
-from PySide6.QtCore import QFile
-from PySide6.QtWidgets import QMessageBox
+from typing import TYPE_CHECKING
+
+import tracing
+
+# Qt is only imported where it is used, so reading and scanning configs does not pay for it
+if TYPE_CHECKING:
+    from PySide6.QtGui import QIcon, QPixmap
+    from PySide6.QtWidgets import QMessageBox
 
 #################################################
 # data directories for program and config files #
@@ -33,7 +45,6 @@ ui_gamescope = os.path.join(DATA_DIR, "gamescope.ui")
 ui_general_settings = os.path.join(DATA_DIR, "general_settings.ui")
 ui_launch_options = os.path.join(DATA_DIR, "launch_options.ui")
 
-ui_env_vars_entry = os.path.join(DATA_DIR, "env_var.ui")
 ui_launch_options_entry = os.path.join(DATA_DIR, "launch_opt.ui")
 
 # SVG file for display on the homepage
@@ -47,28 +58,80 @@ if not os.path.exists(svg_path):
 # Managing Qt UI files #
 ########################
 
-icon = QIcon.fromTheme("io.github.rfrench3.scopebuddy-gui")
-
-def load_widget(ui_file: str, window_title:str='Scopebuddy GUI', icon:QIcon|None=icon):
-    """Load a widget from a UI file and return it."""
-    loader = QUiLoader()
-    ui = QFile(ui_file)
-    ui.open(QFile.OpenModeFlag.ReadOnly)
-    widget = loader.load(ui)
-    ui.close()
+@cache
+def icon() -> 'QIcon':
+    """Returns the app icon, looked up in the icon theme the first time it is needed."""
+    from PySide6.QtGui import QIcon
+    return QIcon.fromTheme("io.github.rfrench3.scopebuddy-gui")
+
+# logo renders by size in pixels, see logo_pixmap
+_logo_pixmaps: 'dict[int, QPixmap]' = {}
+
+def logo_pixmap(size:int=128) -> 'QPixmap':
+    """Returns the app logo as a size x size pixmap (sharp on high DPI screens).
+    The SVG is only rendered once per size, and the pixmap is shared by everything that shows the logo."""
+    if size not in _logo_pixmaps:
+        from PySide6.QtCore import Qt
+        from PySide6.QtGui import QGuiApplication, QPainter, QPixmap
+        from PySide6.QtSvg import QSvgRenderer
+
+        ratio = QGuiApplication.instance().devicePixelRatio() #type:ignore
+        pixmap = QPixmap(round(size * ratio), round(size * ratio))
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        QSvgRenderer(svg_path).render(painter)
+        painter.end()
+        pixmap.setDevicePixelRatio(ratio)
+        _logo_pixmaps[size] = pixmap
+    return _logo_pixmaps[size]
+
+# forms compiled by tools/compile_ui.py, by module name (None if there is no compiled form)
+_compiled_forms: dict = {}
+
+def _compiled_form(ui_file:str):
+    """Returns the compiled module of a UI file (uic_<name>.py next to this file), or None if it was not compiled."""
+    module_name = f"uic_{os.path.splitext(os.path.basename(ui_file))[0]}"
+    if module_name not in _compiled_forms:
+        try:
+            _compiled_forms[module_name] = importlib.import_module(module_name)
+        except ImportError:
+            _compiled_forms[module_name] = None
+    return _compiled_forms[module_name]
+
+@tracing.traced("load_widget", "ui", describe=lambda ui_file, *_, **__: {'ui_file': os.path.basename(ui_file)})
+def load_widget(ui_file: str, window_title:str='Scopebuddy GUI', window_icon:'QIcon|None'=None):
+    """Load a widget from a UI file and return it.\n
+    The form compiled ahead of time by tools/compile_ui.py is used if there is one (the flatpak build compiles them),
+    otherwise the UI file is parsed with QUiLoader."""
+    form = _compiled_form(ui_file)
+    if form is not None:
+        from PySide6 import QtWidgets
+        widget = getattr(QtWidgets, form.BASE_CLASS)()
+        form.FORM_CLASS().setupUi(widget)
+    else:
+        # only needed when running from source without compiled forms
+        from PySide6.QtCore import QFile
+        from PySide6.QtUiTools import QUiLoader
+        loader = QUiLoader()
+        ui = QFile(ui_file)
+        ui.open(QFile.OpenModeFlag.ReadOnly)
+        widget = loader.load(ui)
+        ui.close()
     if widget.isWindow():
         # set window attributes
         widget.setWindowTitle(window_title)
-        widget.setWindowIcon(icon) #type:ignore
+        widget.setWindowIcon(icon() if window_icon is None else window_icon) #type:ignore
     return widget
 
-def load_message_box(parent_window,title:str,  text:str,  icon:QMessageBox.Icon=QMessageBox.Icon.Information,  standard_buttons:QMessageBox.StandardButton=QMessageBox.StandardButton.Ok) -> QMessageBox.StandardButton:
-    """Loads a QMessageBox, returns the result of exec()."""
+def load_message_box(parent_window,title:str,  text:str,  icon:'QMessageBox.Icon|None'=None,  standard_buttons:'QMessageBox.StandardButton|None'=None) -> 'QMessageBox.StandardButton':
+    """Loads a QMessageBox, returns the result of exec().
+    The icon defaults to Information, and the buttons to Ok."""
+    from PySide6.QtWidgets import QMessageBox
     msg = QMessageBox(parent_window)
-    msg.setIcon(icon)
+    msg.setIcon(QMessageBox.Icon.Information if icon is None else icon)
     msg.setWindowTitle(title)
     msg.setText(text)
-    msg.setStandardButtons(standard_buttons)
+    msg.setStandardButtons(QMessageBox.StandardButton.Ok if standard_buttons is None else standard_buttons)
     return msg.exec() #type:ignore
 
 ####################################
@@ -84,6 +147,21 @@ def create_directory() -> None:
     if not os.path.exists(steam_symlink):
         os.symlink(".", steam_symlink, target_is_directory=True)
 
+_bootstrap_lock = Lock()
+_bootstrapped: bool = False
+
+def ensure_scopebuddy_directory() -> None:
+    """Creates what scopebuddy needs on first run: the AppID folder (see create_directory) and the global config.\n
+    Only checked once per run, from whichever thread needs the directory first, so it stays off the path to the window."""
+    global _bootstrapped
+    if _bootstrapped:
+        return
+    with _bootstrap_lock:
+        if not _bootstrapped:
+            create_directory()
+            ScopebuddyDirectory.create_file('scb.conf', 'Global Config file.', SCB_DIR)
+            _bootstrapped = True
+
 def is_filename_invalid(filename:str) -> bool:
     """True if not valid, false otherwise"""
     
@@ -105,20 +183,221 @@ def is_filename_invalid(filename:str) -> bool:
     except (ValueError, OSError):
         return True
 
+def _edits_lines(method):
+    """Runs a ConfigFile edit method inside a transaction, 
+    so the edit is written straight away unless it is part of a larger transaction."""
+    @wraps(method)
+    def edit_in_transaction(self, *args, **kwargs):
+        with self.transaction():
+            return method(self, *args, **kwargs)
+    return edit_in_transaction
+
 '''
 The ConfigFile class:
 PURPOSE: store data about the scopebuddy config file given to it and have simple methods for reading/editing that data.
 OUTPUT: name of file, first line of file (display name), all export lines in file (env vars), gamescope line.
 ALTER: first line of file, all export lines, gamescope line
+The file is read once into self.lines, and everything the app displays is parsed from those lines.
+Edits are made to self.lines, and written once when the transaction they were made in ends.
+self.line_index maps the key of each KEY=value line to its line numbers, so lookups never rescan the file.
+Passing contents keeps the whole document in memory, it is never read from or written to disk.
 '''
 class ConfigFile:
-    def __init__(self,path_to_file:str) -> None:
+    def __init__(self,path_to_file:str, contents:str|None=None) -> None:
         self.path_to_file:str = path_to_file
         self.filename: str = self.print_filename()
-        self.displayname: str = self.print_displayname()
-        self.export_lines: list[str] = self.print_export_lines()
-        self.gamescope_data: dict = self.return_gamescope_data()
-        self.launch_options: str = self.print_launch_options()
+        self.in_memory: bool = contents is not None
+        self.signature: tuple[int, int, int] | None = None # stat signature of the file as it was last read or written
+        self._transaction_depth: int = 0
+        self._unsaved_edits: bool = False
+        self._commit_callbacks: list = [] # see on_commit
+        self.last_changes: list[tuple[int, int]] = [] # line ranges changed by the last save
+
+        if contents is not None:
+            self.lines: list[str] = StringIO(contents).readlines()
+        else:
+            self.lines: list[str] = self._read_lines()
+        self._saved_lines: list[str] = self.lines # the lines as they are on disk
+
+        self._parse_lines()
+
+    # READING/WRITING
+
+    @tracing.traced("ConfigFile read", "io", describe=lambda self: {'path': self.path_to_file})
+    def _read_lines(self) -> list[str]:
+        """Reads the lines of the file from disk."""
+        with open(self.path_to_file, 'r') as file:
+            # stat before reading, so a write that happens during the read makes the signature outdated rather than hiding it
+            self.signature = stat_signature(os.fstat(file.fileno()))
+            return file.readlines()
+
+    def _stage_lines(self, lines:list[str]) -> None:
+        """Replaces the in-memory lines with edited ones and updates the parsed data to match.
+        The edit is written when the transaction it was made in ends."""
+        # split again, an edited line may contain more than one line of text
+        self.lines = StringIO(''.join(lines)).readlines()
+        self._parse_lines()
+        self._unsaved_edits = True
+
+    @tracing.traced("ConfigFile save", "io", describe=lambda self: {'path': self.path_to_file})
+    def save(self) -> list[tuple[int, int]]:
+        """Writes the in-memory lines to the file, unless they are identical to what is already on disk.
+        Files that are kept in memory are never written.\n
+        Returns the [start, end) ranges of line numbers that changed, which is empty if nothing was written.
+        Removed lines show up as empty ranges at the position they were removed from."""
+        changes = self._changed_line_ranges(self._saved_lines, self.lines)
+
+        if changes and not self.in_memory:
+            with open(self.path_to_file, 'w') as file:
+                file.write(''.join(self.lines))
+                file.flush()
+                self.signature = stat_signature(os.fstat(file.fileno()))
+
+        self._saved_lines = self.lines
+        self._unsaved_edits = False
+        self.last_changes = changes
+        return changes
+
+    @staticmethod
+    def _changed_line_ranges(old_lines:list[str], new_lines:list[str]) -> list[tuple[int, int]]:
+        """Returns the [start, end) ranges of new_lines that differ from old_lines."""
+        if old_lines == new_lines:
+            return []
+
+        # only compare the part between the unchanged start and end, edits are usually small
+        start = 0
+        shortest = min(len(old_lines), len(new_lines))
+        while start < shortest and old_lines[start] == new_lines[start]:
+            start += 1
+        end = 0
+        while end < shortest - start and old_lines[-1 - end] == new_lines[-1 - end]:
+            end += 1
+
+        matcher = SequenceMatcher(None, old_lines[start:len(old_lines) - end], new_lines[start:len(new_lines) - end], autojunk=False)
+        return [
+            (start + new_start, start + new_end)
+            for tag, _, _, new_start, new_end in matcher.get_opcodes()
+            if tag != 'equal'
+        ]
+
+    def refresh(self) -> bool:
+        """Re-reads the file if it was changed on disk since it was last read or written.
+        Returns True if it was re-read."""
+        if self.in_memory or stat_signature(os.stat(self.path_to_file)) == self.signature:
+            return False
+        self.reload()
+        return True
+
+    @contextmanager
+    def transaction(self):
+        """Queues every edit made inside the with block against the in-memory lines, 
+        then writes the file once when the outermost block ends.\n
+        If anything inside the block (or the write itself) raises, the edits and the on_commit callbacks are discarded."""
+        outermost: bool = self._transaction_depth == 0
+        if outermost:
+            self.refresh()
+            original_lines = self.lines
+
+        self._transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            if outermost:
+                self._discard_edits(original_lines)
+            raise
+        finally:
+            self._transaction_depth -= 1
+
+        if not outermost:
+            return
+        if not self._unsaved_edits:
+            self.last_changes = []
+        else:
+            try:
+                self.save()
+            except OSError:
+                self._discard_edits(original_lines)
+                raise
+
+        callbacks, self._commit_callbacks = self._commit_callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def on_commit(self, callback) -> None:
+        """Calls callback once the edits made so far are written: right away outside of a transaction,
+        otherwise once the outermost transaction has written the file. It is never called if that fails."""
+        if self._transaction_depth == 0:
+            callback()
+        else:
+            self._commit_callbacks.append(callback)
+
+    def _discard_edits(self, original_lines:list[str]) -> None:
+        self._commit_callbacks = []
+        self.lines = original_lines
+        self._parse_lines()
+        self._unsaved_edits = False
+
+    @tracing.traced("ConfigFile parse", "io", describe=lambda self: {'path': self.path_to_file})
+    def _parse_lines(self) -> None:
+        """Reads the display name, export lines, gamescope line and launch options from self.lines,
+        and indexes the lines by key."""
+        if self.path_to_file == GLOBAL_CONFIG:
+            self.displayname: str = "Global Config"
+        else:
+            first_line = self.lines[0].strip() if self.lines else ''
+            self.displayname: str = first_line[2:] if first_line.startswith("# ") else self.filename
+
+        self.line_index: dict[str, list[int]] = self._build_line_index(self.lines)
+        self.export_lines, self.gamescope_data, self.launch_options = parse_settings(self.lines)
+
+    def reload(self) -> None:
+        """Re-reads the file from disk, discarding the parsed data."""
+        if self.in_memory:
+            return
+        self.lines = self._read_lines()
+        self._saved_lines = self.lines
+        self._parse_lines()
+
+    @staticmethod
+    def _build_line_index(lines:list[str]) -> dict[str, list[int]]:
+        """Maps the part of each line before its first '=' to the numbers of the lines that start with it."""
+        index: dict[str, list[int]] = {}
+        for i, line in enumerate(lines):
+            key, separator, _ = line.partition('=')
+            if separator:
+                index.setdefault(key, []).append(i)
+        return index
+
+    @staticmethod
+    def _find_line(lines:list[str], index:dict[str, list[int]], startswith:str) -> int | None:
+        """Returns the number of the first line that starts with startswith, or None.\n
+        Any line starting with a value that contains '=' shares its key, so only that key's lines are checked.
+        Values without an '=' fall back to checking every line."""
+        key, separator, _ = startswith.partition('=')
+        if separator:
+            for i in index.get(key, ()):
+                if lines[i].startswith(startswith):
+                    return i
+            return None
+
+        for i, line in enumerate(lines):
+            if line.startswith(startswith):
+                return i
+        return None
+
+    @staticmethod
+    def _reindex_line(index:dict[str, list[int]], i:int, old_line:str, new_line:str) -> None:
+        """Moves line number i to the key of its new contents."""
+        old_key, old_separator, _ = old_line.partition('=')
+        new_key, new_separator, _ = new_line.partition('=')
+        if old_separator == new_separator and old_key == new_key:
+            return
+        if old_separator:
+            index[old_key].remove(i)
+            if not index[old_key]:
+                del index[old_key]
+        if new_separator:
+            insort(index.setdefault(new_key, []), i)
 
     # DATA OUTPUT
 
@@ -126,11 +405,11 @@ class ConfigFile:
         """Returns all relevant information in the active file."""
         output: str = (
             f"Path to File: {self.path_to_file}\n"
-            f"Filename: {self.print_filename()}\n"
-            f"Display Name: {self.print_displayname()}\n"
-            f"Export Lines: {self.print_export_lines()}\n"
-            f"Gamescope Line: {self.return_gamescope_data()['args']}"
-            f"Launch Options: {self.print_launch_options()}"
+            f"Filename: {self.filename}\n"
+            f"Display Name: {self.displayname}\n"
+            f"Export Lines: {self.export_lines}\n"
+            f"Gamescope Line: {self.gamescope_data['args']}\n"
+            f"Launch Options: {self.launch_options}"
         )
         return output
     
@@ -143,100 +422,51 @@ class ConfigFile:
         return os.path.basename(self.path_to_file)
     
     def print_displayname(self) -> str:
-        """Read the display name (the commented out line 1) from the active file.
+        """Returns the display name (the commented out line 1) of the file.
         If the first line does not start with "# ", return the file name instead."""
-        if self.path_to_file == GLOBAL_CONFIG:
-            return "Global Config"
-        with open(self.path_to_file, 'r') as file:
-            first_line = file.readline().strip()
-            if first_line.startswith("# "):
-                return first_line[2:]
-            else:
-                return self.print_filename()
+        return self.displayname
     
     def print_export_lines(self) -> list[str]:
         """Returns a list of active export lines (Environment Variables)."""
-        export_lines: list[str] = []
-        with open(self.path_to_file, 'r') as file:
-            lines = file.readlines()
-
-        for line in lines:
-            if line.startswith('export '):
-                export_lines.append(line[7:-1])
-        return export_lines
+        return self.export_lines[:]
 
     def return_gamescope_data(self) -> dict:
         """return dictionary about the gamescope line's status.\n
         args: gamescope args\n
         active:  is a gamescope line active?"""
-        data = {
-            'args': '',
-            'active': False
-        }
-
-        with open(self.path_to_file, 'r') as file:
-            lines = file.readlines()
-
-        for line in lines:
-            # an active line would never automatically be placed above an automatically commented out line
-            if line.startswith('SCB_GAMESCOPE_ARGS='):
-                data['active'] = True
-
-            if (line.startswith('SCB_GAMESCOPE_ARGS=') or
-                line.startswith('#SCBGUI#SCB_GAMESCOPE_ARGS=') or
-                line.startswith('#SCB_GAMESCOPE_ARGS=')
-                ):
-                
-                # return args
-                match = search(r'SCB_GAMESCOPE_ARGS="([^"]*)"', line)                
-                data['args'] = match.group(1) if match else ''
-
-        return data
+        return dict(self.gamescope_data)
 
     def print_launch_options(self) -> str:
         """Returns the stored launch options as a string."""
-        with open(self.path_to_file, 'r') as file:
-            lines = file.readlines()
-
-        for line in lines:
-            if line.startswith(r'command+='):
-                match = search(r"command\+='([^']*)'", line)
-                if match:
-                    return match.group(1)
-                
-        return ''
+        return self.launch_options
     
+    def summary(self) -> dict:
+        """Returns the parsed settings of the file as plain data, such as for storing in an index.\n
+        settings: every active SCB_ line other than the gamescope line, such as SCB_NOSCOPE=1"""
+        return _summary(self.displayname, self.lines, self.export_lines[:], self.gamescope_data, self.launch_options)
+
     def check_for_exact_line(self,startswith:str) -> bool:
         """Checks for a line that starts with a certain value. 
         Returns True if exactly that line it is found."""
-
-        with open(self.path_to_file, 'r') as file:
-            lines = file.readlines()
-
-        for line in lines:
-            if line.startswith(startswith):
-                return True
-        else:
-            return False
+        return self._find_line(self.lines, self.line_index, startswith) is not None
 
     
     # DATA EDITING
     
+    @_edits_lines
     def edit_displayname(self, new_name:str) -> None:
         """Changes the display name (the commented out line 1) inside the file.
         Does not save the old display name when doing this."""
         
         try:
-            with open(self.path_to_file, 'r') as file:
-                lines = file.readlines()
+            lines = self.lines[:]
 
             if lines and lines[0].startswith("# "):
                 lines[0] = f"# {new_name}\n"
             else:
                 lines.insert(0,f"# {new_name}\n")
 
-            with open(self.path_to_file, 'w') as file:
-                file.writelines(lines)
+            self._stage_lines(lines)
 
         except OSError as e:
             raise
@@ -245,66 +475,80 @@ class ConfigFile:
             raise
             
         
+    @_edits_lines
     def edit_export_lines(self, new_lines:list[str]) -> None:
         """Changes the export lines in the file to the newly listed ones by commenting out
         or uncommenting in lines, only adding new lines when necessary.\n
         Will raise OSError if it fails."""
         try:
-            with open(self.path_to_file, 'r') as file:
-                lines = file.readlines()
+            lines = self.lines[:]
             
             if lines and not lines[-1].endswith('\n'):
                 lines[-1] += '\n'
 
-            # disable all oldlines
+            # index the new variables by name (the part before '='), keeping the order they were given in.
+            # a variable only re-enables a line that starts with it, so a variable with an '=' can only
+            # match lines with the same name. Variables without one are checked against every export line.
+            named_variables: dict[str, list[int]] = {}
+            unnamed_variables: list[int] = []
+            for position, variable in enumerate(new_lines):
+                name, separator, _ = variable.partition('=')
+                if separator:
+                    named_variables.setdefault(name, []).append(position)
+                else:
+                    unnamed_variables.append(position)
+            unused: list[bool] = [True] * len(new_lines)
+
+            # disable every export line, except those that match the earliest unused new variable
             for i, oldline in enumerate(lines):
                 if oldline.startswith("export "):
-                    lines[i] = f"#{oldline}" 
-            
-            # re-enable any oldlines that match a newline
-            for i, oldline in enumerate(lines):
-                if oldline.startswith("#export "):
-                    for newline in new_lines[:]:
-                        if oldline.startswith(f"#export {newline}"): # accounts for comments
-                            new_lines.remove(newline)
-                            lines[i] = oldline[1:]
-                            break
+                    exported = oldline[7:]
+                elif oldline.startswith("#export "):
+                    exported = oldline[8:]
+                else:
+                    continue
 
+                match: int | None = None
+                for candidates in (named_variables.get(exported.partition('=')[0], ()), unnamed_variables):
+                    for position in candidates:
+                        if exported.startswith(new_lines[position]): # accounts for comments
+                            if match is None or position < match:
+                                match = position
+                            break
 
-            # append any newlines not in oldlines to the file
-            if new_lines:
+                if match is None:
+                    lines[i] = f"#export {exported}"
+                else:
+                    unused[match] = False
+                    name, separator, _ = new_lines[match].partition('=')
+                    (named_variables[name] if separator else unnamed_variables).remove(match)
+                    lines[i] = f"export {exported}"
+
+            new_exports: list[str] = [
+                f"export {variable}\n"
+                for position, variable in enumerate(new_lines)
+                if unused[position]
+            ]
 
-                
-                for i, line in enumerate(lines[:]):
-                    if i == 0:
-                        continue
-                    
+            if new_exports:
+                # place the new exports right after the first block of export lines,
+                # or at the end of the file if it has none
+                insert_at: int = len(lines)
+                for i in range(1, len(lines)):
                     prev_line_is_export:bool = (lines[i-1].startswith("export ") or lines[i-1].startswith("#export "))
-                    curr_line_is_not_export:bool = not (line.startswith("export ") or line.startswith("#export "))
+                    curr_line_is_not_export:bool = not (lines[i].startswith("export ") or lines[i].startswith("#export "))
 
                     if prev_line_is_export and curr_line_is_not_export:
-                        
-                        for export in new_lines[::-1]:
-                            lines.insert(i, f"export {export}\n")
-                            new_lines.remove(export)
-                        
+                        insert_at = i
                         break
-            
-            # append new exports to the end of the file, because none were found within the file
-            if new_lines:
-                
-                append_lines = [
-                    f"export {line}\n"
-                    for line in new_lines
-                ]
 
-                lines.extend(append_lines)
+                lines = lines[:insert_at] + new_exports + lines[insert_at:]
 
-            with open(self.path_to_file,'w') as file:
-                file.writelines(lines)
+            self._stage_lines(lines)
         except OSError as e:
             raise
 
+    @_edits_lines
     def edit_gamescope_line(self, arguments:str, active:bool) -> None:
         """Changes the gamescope line in the file to the newly listed ones by commenting out
         or uncommenting in lines, only adding new lines when necessary.
@@ -313,8 +557,7 @@ class ConfigFile:
         new_args = [arguments]
 
         try:
-            with open(self.path_to_file, 'r') as file:
-                lines = file.readlines()
+            lines = self.lines[:]
 
             if lines and not lines[-1].endswith('\n'):
                 lines[-1] += '\n'
@@ -385,13 +628,11 @@ class ConfigFile:
 
 
 
-            with open(self.path_to_file,'w') as file:
-                file.writelines(lines)
-
-            self.gamescope_data = self.return_gamescope_data()
+            self._stage_lines(lines)
         except OSError as e:
             raise
 
+    @_edits_lines
     def update_gamescope_data(self, data:dict, DEPRACATED=True) -> None:
         """Update information about the gamescope line's status.\n
         args: str, gamescope args\n
@@ -404,8 +645,7 @@ class ConfigFile:
             # if true, no gamescope line in the file
             disable_gamescope:bool = data['inactive']
 
-            with open(self.path_to_file, 'r') as file:
-                lines = file.readlines()
+            lines = self.lines[:]
             if lines and not lines[-1].endswith('\n'):
                 lines[-1] += '\n'
 
@@ -445,15 +685,12 @@ class ConfigFile:
                 # no scb_gamescope_args in file, put it at the end
                 new_lines.append(new_line)
 
-            with open(self.path_to_file, 'w') as file: 
-                file.writelines(new_lines)
-
-            # update gamescope data stored by program
-            self.gamescope_data = self.return_gamescope_data()
+            self._stage_lines(new_lines)
             return
         except OSError as e:
             raise
     
+    @_edits_lines
     def edit_exact_lines(self,start_with:list[str],new_lines:list[str],  opened_lines: list[str]|None=None) -> None | list[str]:
         """Checks for any lines that start with the start_with string, 
         replaces that portion with the string in the 2nd list's same index.\n
@@ -468,25 +705,25 @@ class ConfigFile:
             if opened_lines:
                 lines = opened_lines
             else:
-                with open(self.path_to_file, 'r') as file:
-                    lines = file.readlines()
+                lines = self.lines[:]
                 if lines and not lines[-1].endswith('\n'):
                     lines[-1] += '\n'
 
             lines_to_append = []
+            index = self._build_line_index(lines)
             
             for j, start_str in enumerate(start_with):
                 found = False
-                for i, line in enumerate(lines):
-                    if start_str == '':
-                        break # empty start_str means new line
-
-                    if line.startswith(start_str):
-                        # Preserve any data after the start_str portion, such as comments left by the user
-                        remaining_data = line[len(start_str):]
-                        lines[i] = new_lines[j] + remaining_data
-                        found = True
-                        break
+                # empty start_str means new line
+                i = self._find_line(lines, index, start_str) if start_str else None
+
+                if i is not None:
+                    # Preserve any data after the start_str portion, such as comments left by the user
+                    remaining_data = lines[i][len(start_str):]
+                    new_line = new_lines[j] + remaining_data
+                    self._reindex_line(index, i, lines[i], new_line)
+                    lines[i] = new_line
+                    found = True
                 
                 if not found:
                     # Add newline if the new line doesn't already end with one
@@ -500,18 +737,17 @@ class ConfigFile:
             if opened_lines:
                 return lines
             else:    
-                with open(self.path_to_file, 'w') as file:
-                    file.writelines(lines)
+                self._stage_lines(lines)
         except OSError as e:
             raise
             
+    @_edits_lines
     def edit_launch_options(self, new_flags:str) -> None:
         """Changes the launch options in the file to the newly listed ones."""
 
         new_line = f"command+=' {new_flags.strip()}'\n"
 
-        with open(self.path_to_file, 'r') as file:
-            lines = file.readlines()
+        lines = self.lines[:]
 
         if lines and not lines[-1].endswith('\n'):
             lines[-1] += '\n'
@@ -520,20 +756,239 @@ class ConfigFile:
             if line.startswith('command+='):
 
                 lines[i] = new_line
-                with open(self.path_to_file, 'w') as file: 
-                    file.writelines(lines)
-                # update launch options line stored by program
-                self.launch_options: str = self.print_launch_options()
+                self._stage_lines(lines)
                 return
             
         # place launch options line at the end, because no line was found in the file
-        with open(self.path_to_file, 'a') as file: 
-            file.writelines(new_line)
-        self.launch_options: str = self.print_launch_options()
+        lines.append(new_line)
+        self._stage_lines(lines)
         return
 
 
 
+def stat_signature(stat_result:os.stat_result) -> tuple[int, int, int]:
+    """Returns the (mtime, size, inode) of a stat result, which changes whenever a file is edited or replaced."""
+    return (stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino)
+
+def stat_signature_of(file_data:dict) -> tuple[int, int, int]:
+    """Returns the stat signature of a file entry from ScopebuddyDirectory.return_filesystem_information."""
+    return (file_data['mtime'], file_data['size'], file_data['inode'])
+
+# Largest number of bytes read when only a file's display name is needed
+HEADER_READ_LIMIT: int = 4096
+
+def scan_displayname(path_to_file:str) -> str:
+    """Returns the display name of a config file the same way ConfigFile does, 
+    but only reads the start of the first line instead of parsing the whole file."""
+    filename = os.path.basename(path_to_file)
+    if path_to_file == GLOBAL_CONFIG:
+        return "Global Config"
+
+    with open(path_to_file, 'rb', buffering=0) as file:
+        header = file.read(HEADER_READ_LIMIT)
+
+    first_line = header.splitlines()[0].decode(errors='replace').strip() if header else ''
+    if first_line.startswith("# "):
+        return first_line[2:]
+    return filename
+
+def parse_settings(lines:list[str]) -> tuple[list[str], dict, str]:
+    """Returns the export lines, gamescope data ({args, active}) and launch options of the lines of a config,
+    as ConfigFile parses them."""
+    export_lines: list[str] = []
+    gamescope_data: dict = {
+        'args': '',
+        'active': False
+    }
+    launch_options: str = ''
+    launch_options_found = False
+
+    for line in lines:
+        if line.startswith('export '):
+            export_lines.append(line[7:-1])
+
+        # an active line would never automatically be placed above an automatically commented out line
+        elif line.startswith('SCB_GAMESCOPE_ARGS='):
+            gamescope_data['active'] = True
+            match = search(r'SCB_GAMESCOPE_ARGS="([^"]*)"', line)
+            gamescope_data['args'] = match.group(1) if match else ''
+
+        elif line.startswith('#SCBGUI#SCB_GAMESCOPE_ARGS=') or line.startswith('#SCB_GAMESCOPE_ARGS='):
+            match = search(r'SCB_GAMESCOPE_ARGS="([^"]*)"', line)
+            gamescope_data['args'] = match.group(1) if match else ''
+
+        elif line.startswith('command+=') and not launch_options_found:
+            match = search(r"command\+='([^']*)'", line)
+            if match:
+                launch_options = match.group(1)
+                launch_options_found = True
+
+    return export_lines, gamescope_data, launch_options
+
+def _summary(displayname:str, lines:list[str], export_lines:list[str], gamescope_data:dict, launch_options:str) -> dict:
+    """Builds the summary returned by ConfigFile.summary and scan_summary."""
+    return {
+        'displayname': displayname,
+        'exports': export_lines,
+        'gamescope_args': gamescope_data['args'],
+        'gamescope_active': gamescope_data['active'],
+        'launch_options': launch_options,
+        'settings': [
+            line.strip()
+            for line in lines
+            if line.startswith('SCB_') and not line.startswith('SCB_GAMESCOPE_ARGS=')
+        ]
+    }
+
+def scan_summary(path_to_file:str) -> dict:
+    """Returns the same summary as ConfigFile.summary, for indexing many configs at once.
+    Only what the summary needs is parsed, and nothing is kept, so config_cache (the files being edited) is left alone."""
+    with open(path_to_file, 'r') as file:
+        lines = file.readlines()
+
+    if path_to_file == GLOBAL_CONFIG:
+        displayname = "Global Config"
+    else:
+        first_line = lines[0].strip() if lines else ''
+        displayname = first_line[2:] if first_line.startswith("# ") else os.path.basename(path_to_file)
+    return _summary(displayname, lines, *parse_settings(lines))
+
+'''
+The ConfigCache class:
+PURPOSE: share parsed ConfigFiles across the whole program, so unchanged files are never parsed twice.
+A cached ConfigFile is only reused while the stat signature of its file matches the one it was read with.
+The least recently used files are dropped once more than max_size files are cached.
+'''
+class ConfigCache:
+    def __init__(self, max_size:int) -> None:
+        self.max_size: int = max_size
+        self._configs: OrderedDict[str, ConfigFile] = OrderedDict()
+        self._lock = Lock() # directory scans may read files from several threads
+
+    def get(self, path_to_file:str) -> ConfigFile:
+        """Returns the ConfigFile for the path, only parsing the file if it changed since it was cached.\n
+        Raises OSError if the file cannot be read."""
+        signature = stat_signature(os.stat(path_to_file))
+
+        with self._lock:
+            config = self._configs.get(path_to_file)
+            if config is not None and config.signature == signature:
+                self._configs.move_to_end(path_to_file)
+                return config
+
+        config = ConfigFile(path_to_file)
+
+        with self._lock:
+            self._configs[path_to_file] = config
+            self._configs.move_to_end(path_to_file)
+            self._evict()
+        return config
+
+    def discard(self, path_to_file:str) -> None:
+        """Forgets the cached copy of a file, such as one that was deleted."""
+        with self._lock:
+            self._configs.pop(path_to_file, None)
+
+    def clear(self) -> None:
+        """Forgets every cached file."""
+        with self._lock:
+            self._configs.clear()
+
+    def resize(self, max_size:int) -> None:
+        """Changes how many files can be cached, dropping the least recently used ones if needed."""
+        with self._lock:
+            self.max_size = max_size
+            self._evict()
+
+    def _evict(self) -> None:
+        while len(self._configs) > self.max_size:
+            self._configs.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._configs)
+
+# Number of parsed config files kept in memory
+CONFIG_CACHE_SIZE: int = 1024
+config_cache = ConfigCache(CONFIG_CACHE_SIZE)
+
+# Threads only make scanning faster where each read waits on the disk or the network (NFS, spinning disks),
+# on a local SSD they are slower, so scans are serial unless SCOPEBUDDY_GUI_SCAN_WORKERS=threads is set
+SCAN_WORKERS_ENV: str = "SCOPEBUDDY_GUI_SCAN_WORKERS"
+
+def _scan_workers_setting() -> int:
+    """Returns the number of threads scans use, from SCAN_WORKERS_ENV. 1 scans without any threads."""
+    value = os.environ.get(SCAN_WORKERS_ENV, '').strip()
+    if not value:
+        return 1
+    try:
+        return max(int(value), 1)
+    except ValueError:
+        print(f"Ignoring {SCAN_WORKERS_ENV}={value}, it should be a number of threads")
+        return 1
+
+# Number of threads used to scan the scopebuddy directory, 1 scans without any threads
+SCAN_WORKERS: int = _scan_workers_setting()
+
+# Number of launcher folders scanned before ScopebuddyDirectory.scan_launchers hands them over
+LAUNCHER_BATCH_SIZE: int = 8
+
+
+'''
+The FolderVisits class:
+PURPOSE: let a scan list each folder only once, however many symlinks lead to it. This covers AppID/steam -> AppID,
+folders shared by several launchers and symlink loops made by the user.
+STORED: the (st_dev, st_ino) of every folder the scan reached, with the path and children of the first item found for it.
+OUTPUT: every later item for the same folder is an alias. It is not listed again: it gets alias_of (the path of
+the first item) and shares the file items of the first item as its children, once that folder has been listed.
+Its subfolders are left out, they are already part of the tree (and would loop forever otherwise).
+'''
+class FolderVisits:
+    def __init__(self, root:str, children:dict) -> None:
+        self.folders: dict[tuple[int, int], tuple[str, dict]] = {} # (st_dev, st_ino): (path, children)
+        self.listed: set[tuple[int, int]] = set()
+        self.aliases: dict[str, str] = {} # path of an alias: path of the folder it leads to
+        self._pending: list[tuple[dict, tuple[int, int]]] = []
+
+        try:
+            stat = os.stat(root)
+        except Exception as e:
+            print(f"return_filesystem_information ERROR! {e}")
+            raise e
+        self.root: tuple[int, int] = (stat.st_dev, stat.st_ino)
+        self.folders[self.root] = (root, children)
+
+    def visit(self, identity:tuple[int, int], item:dict) -> bool:
+        """Returns True the first time a folder is reached, meaning it has to be listed.
+        Otherwise the item is recorded as an alias, and filled in by resolve."""
+        if identity not in self.folders:
+            self.folders[identity] = (item['path'], item['children'])
+            return True
+
+        path, _ = self.folders[identity]
+        item['alias_of'] = path
+        self.aliases[item['path']] = path
+        self._pending.append((item, identity))
+        return False
+
+    def mark_listed(self, identity:tuple[int, int]) -> None:
+        """Records that a folder (the root, or one visit returned True for) has been listed into its children."""
+        self.listed.add(identity)
+
+    def resolve(self) -> list[dict]:
+        """Fills in the aliases of the folders listed so far, and returns them."""
+        resolved = []
+        pending = []
+        for item, identity in self._pending:
+            if identity not in self.listed:
+                pending.append((item, identity))
+                continue
+            _, children = self.folders[identity]
+            item['children'].update({name: child for name, child in children.items() if child['type'] == 'file'})
+            resolved.append(item)
+        self._pending = pending
+        return resolved
+
+
 '''
 The ScopebuddyDirectory class:
 PURPOSE: store data about the scopebuddy directory and its files and have simple methods for reading/editing that data.
@@ -542,94 +997,183 @@ ALTER: add new files to directory
 '''
 
 class ScopebuddyDirectory:
-    def __init__(self) -> None:
+    def __init__(self, scan_workers:int|None=None, index=None, scan:bool=True) -> None:
         self.directory_path = os.path.join(os.environ.get("XDG_CONFIG_HOME", os.path.expanduser("~/.config")), "scopebuddy")
         self.appid_path = os.path.join(self.directory_path,"AppID")
+        self.scan_workers: int = SCAN_WORKERS if scan_workers is None else scan_workers
+        self.index = index
+        ensure_scopebuddy_directory()
 
         # store all necessary info about files and their paths for the file selection part of the app
-        self.full_directory = self.return_filesystem_information(self.directory_path)
+        # (a directory_index.DirectoryIndex only rescans and reparses what changed since the last run)
+        # with scan=False, it is filled in by scan_launchers instead
+        self.full_directory: dict = {}
+        # path: path of the folder it leads to, for every folder reached again through a symlink (see FolderVisits)
+        self.aliases: dict[str, str] = {}
+        if scan and index is not None:
+            self.full_directory = index.refresh(self)
+        elif scan:
+            self.full_directory = self.return_filesystem_information(self.directory_path)
+
+    @tracing.traced("directory scan", "scan", describe=lambda self, *_, **__: {'indexed': self.index is not None})
+    def scan_launchers(self, batch_size:int=LAUNCHER_BATCH_SIZE):
+        """Generator that scans the directory into self.full_directory, the same way __init__ does.\n
+        Yields lists of up to batch_size launcher folder items (the folders inside AppID) as soon as their configs
+        have been read, so they can be shown before the scan finishes. self.full_directory is complete once it is exhausted."""
+        self.full_directory = {}
+
+        if self.index is not None:
+            batches = self.index.iter_refresh(self, self.full_directory, batch_size)
+            yield from self._launcher_batches(batches)
+        elif self.scan_workers <= 1:
+            batches = self._iter_scan_tree(self.directory_path, False, map, self.full_directory, batch_size)
+            yield from self._launcher_batches(batches)
+        else:
+            with ThreadPoolExecutor(max_workers=self.scan_workers) as executor:
+                batches = self._iter_scan_tree(self.directory_path, False, executor.map, self.full_directory, batch_size)
+                yield from self._launcher_batches(batches)
+
+    def _launcher_batches(self, batches):
+        """Filters batches of scanned folder items down to the launchers."""
+        for folders in batches:
+            launchers = [folder for folder in folders if os.path.dirname(folder['path']) == self.appid_path]
+            if launchers:
+                yield launchers
         
     def __str__(self) -> str:
         """Returns detected path to scopebuddy directory."""
         return self.directory_path
     
+    def _config_paths(self) -> list[str]:
+        """Returns the paths of the config files directly inside the AppID folder."""
+        with os.scandir(self.appid_path) as entries:
+            return [entry.path for entry in entries if entry.name.endswith(".conf") and entry.is_file()]
+
     def print_files_list(self) -> list[str]:
         """Returns a list of readable strings describing each config file."""
-
-        config_files = [
-            ConfigFile(os.path.join(self.appid_path, file))
-            for file in os.listdir(self.appid_path)
-            if os.path.isfile(os.path.join(self.appid_path, file)) and file.endswith(".conf")
-            ]
-
-
-        return [f"{config.print_filename()}: {config.print_displayname()}" for config in config_files]
+        return [f"{os.path.basename(path)}: {scan_displayname(path)}" for path in self._config_paths()]
     
     def print_appid_dict(self) -> dict[str, str]:
         """Returns a dictionary of filepath: displayname"""
+        return {path: scan_displayname(path) for path in self._config_paths()}
 
-        config_files = [
-            ConfigFile(os.path.join(self.appid_path, file))
-            for file in os.listdir(self.appid_path)
-            if os.path.isfile(os.path.join(self.appid_path, file)) and file.endswith(".conf")
-            ]
-        
-        return {config.print_path(): config.print_displayname() for config in config_files}
-
+    @tracing.traced("directory scan", "scan", describe=lambda self, directory, *_: {'directory': directory, 'workers': self.scan_workers})
     def return_filesystem_information(self, directory: str, _ignore_subfolders:bool=False) -> dict:
         """Returns a nested dictionary about the scopebuddy directory.\n
-        All entries have type=file/folder, path=path, name=filename.\n
-        Files have displayname, 
-        folders have a children that contains its own nested dictionary.
+        All entries have type=file/folder, path=path, name=filename, mtime=modification time in ns, inode.\n
+        Files have size and displayname (displayname only for .conf files), 
+        folders have a children that contains its own nested dictionary.\n
+        The folders of each level of the tree, then the headers of their config files, are read on a pool of
+        self.scan_workers threads. The result is the same as scanning with a single worker.
         """
+        if self.scan_workers <= 1:
+            return self._scan_tree(directory, _ignore_subfolders, map)
+
+        with ThreadPoolExecutor(max_workers=self.scan_workers) as executor:
+            return self._scan_tree(directory, _ignore_subfolders, executor.map)
+
+    def _scan_tree(self, directory: str, ignore_subfolders:bool, map_function) -> dict:
+        """Scans the tree one level at a time, using map_function (map, or a thread pool's map) 
+        for the folder listings and header reads of each level. Results are merged in listing order."""
         information = {}
+        for _ in self._iter_scan_tree(directory, ignore_subfolders, map_function, information):
+            pass
+        return information
+
+    def _iter_scan_tree(self, directory: str, ignore_subfolders:bool, map_function, information:dict, batch_size:int|None=None):
+        """Generator version of _scan_tree that fills in information as it goes.\n
+        Each level is scanned batch_size folders at a time (all at once if None), 
+        yielding the folder items of every batch once their configs have been read.
+        Folders reached again through a symlink are aliases (see FolderVisits), they are yielded once filled in."""
+        visits = FolderVisits(directory, information)
+        self.aliases = visits.aliases
+        level: list[tuple[str, tuple[int, int], dict, dict | None]] = [(directory, visits.root, information, None)]
+
+        while level:
+            next_level = []
+            step = batch_size or len(level)
+            for start in range(0, len(level), step):
+                batch = level[start:start + step]
+                listings = list(map_function(self.list_folder, [folder for folder, *_ in batch], [ignore_subfolders] * len(batch)))
+
+                config_items = [
+                    item
+                    for items, _ in listings
+                    for item in items.values()
+                    if item['type'] == 'file' and item['name'].endswith('.conf')
+                ]
+                for item, displayname in zip(config_items, map_function(self.read_displayname, [item['path'] for item in config_items])):
+                    item['displayname'] = displayname
+
+                for (_, identity, folder_information, _), (items, subfolders) in zip(batch, listings):
+                    folder_information.update(items)
+                    visits.mark_listed(identity)
+                    for path, subfolder_identity, children in subfolders:
+                        item = items[os.path.basename(path)]
+                        if visits.visit(subfolder_identity, item):
+                            next_level.append((path, subfolder_identity, children, item))
+
+                yield [item for *_, item in batch if item is not None] + visits.resolve()
+            level = next_level
+
+    @staticmethod
+    def list_folder(directory: str, ignore_subfolders:bool) -> tuple[dict, list[tuple[str, tuple[int, int], dict]]]:
+        """Lists a single folder. Returns its items (without display names), 
+        and the (path, (st_dev, st_ino), children) of each subfolder, symlinks followed (see FolderVisits).
+        Symlinked subfolders come last, so the folder a symlink leads to is visited first if it is in the same folder."""
+        items = {}
+        subfolders = []
+        symlinked_subfolders = []
 
-        # Scan directory for all items
         try:
-            items = os.listdir(directory)
+            with os.scandir(directory) as scanned:
+                entries = list(scanned)
         except Exception as e:
             print(f"return_filesystem_information ERROR! {e}")
             raise e
 
-        for name in items:
-            path = os.path.join(directory, name)
+        for entry in entries:
+            try:
+                is_file = entry.is_file()
+                is_folder = not is_file and not ignore_subfolders and entry.is_dir()
+                if not (is_file or is_folder):
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue # removed while scanning, or a broken symlink
 
-            if os.path.isfile(path):
-                # Handle files - add displayname for .conf files
-                item = {
+            if is_file:
+                items[entry.name] = {
                     'type': 'file',
-                    'path': path,
-                    'name': name
+                    'path': entry.path,
+                    'name': entry.name,
+                    'mtime': stat.st_mtime_ns,
+                    'size': stat.st_size,
+                    'inode': stat.st_ino
                 }
-                
-                # Add displayname for config files
-                if name.endswith('.conf'):
-                    try:
-                        config = ConfigFile(path)
-                        item['displayname'] = config.print_displayname()
-                    except Exception as e:
-                        item['displayname'] = name
-                        print(e)
-                
-                information[name] = item
-                
-            elif os.path.isdir(path) and not _ignore_subfolders:
-                # Handle folders - recursively scan subdirectories
+            else:
                 item = {
                     'type': 'folder',
-                    'path': path,
-                    'name': name,
+                    'path': entry.path,
+                    'name': entry.name,
+                    'mtime': stat.st_mtime_ns,
+                    'inode': stat.st_ino,
                     'children': {}
                 }
+                items[entry.name] = item
+                subfolder = (entry.path, (stat.st_dev, stat.st_ino), item['children'])
+                (symlinked_subfolders if entry.is_symlink() else subfolders).append(subfolder)
 
-                # handles symlinks (such as AppID/steam -> AppID) by refusing to check more than one layer of symlink
-                ignore_next_level = os.path.islink(path)
-
-                item['children'] = self.return_filesystem_information(path, ignore_next_level)  # Recursive call
-
-                information[name] = item
+        return items, subfolders + symlinked_subfolders
 
-        return information
+    @staticmethod
+    def read_displayname(path:str) -> str:
+        """Returns the display name of a config file, or its file name if it cannot be read."""
+        try:
+            return scan_displayname(path)
+        except Exception as e:
+            print(e)
+            return os.path.basename(path)
 
     # DATA EDITING
 
@@ -649,7 +1193,7 @@ class ScopebuddyDirectory:
                 raise FileExistsError
             else:
                 shutil.copyfile(TEMPLATE, new_file_path)
-                new_file = ConfigFile(new_file_path)
+                new_file = config_cache.get(new_file_path)
 
                 if displayname:
                     new_file.edit_displayname(displayname)
@@ -679,6 +1223,7 @@ class ScopebuddyDirectory:
         try:
             if os.path.isfile(path):
                 os.remove(path)
+                config_cache.discard(path)
                 return False
             else:
                 raise ValueError("File not found at the given path.")
@@ -709,6 +1254,7 @@ class ScopebuddyDirectory:
         """Deletes the global config file and then restores a fresh copy."""
         try:
             os.remove(os.path.join(SCB_DIR, "scb.conf"))
+            config_cache.discard(os.path.join(SCB_DIR, "scb.conf"))
             ScopebuddyDirectory.create_file('scb.conf','Global Config file.',SCB_DIR)
         except Exception as e:
             raise e
\ No newline at end of file
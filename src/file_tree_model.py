@@ -0,0 +1,326 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2024-2025 Robert French (rfrench3, TealMango)
+
+import os
+
+from PySide6.QtCore import QAbstractItemModel, QModelIndex, Qt
+
+import file_manager as fman
+
+# number of configs added to the tree each time a launcher is expanded or scrolled to the end of its configs
+FETCH_BATCH_SIZE: int = 256
+
+# kinds of rows in the tree
+GLOBAL: str = 'global'
+SCANNING: str = 'scanning'
+LAUNCHER: str = 'launcher'
+CONFIG: str = 'config'
+
+
+class _TopLevelRow:
+    """A row at the top of the tree: Global, the scanning indicator or a launcher folder."""
+    def __init__(self, kind:str, name:str='', inode:int=0) -> None:
+        self.kind: str = kind
+        self.name: str = name
+        self.inode: int = inode
+        self.row: int = 0
+        self.configs: list[dict] = [] # file entries, in the format of ScopebuddyDirectory.return_filesystem_information
+        self.fetched: int = 0 # how many of the configs are rows of the model so far
+
+
+'''
+The FileTreeModel class:
+PURPOSE: provide the welcome page's file tree (Global, then each launcher folder inside AppID and its configs)
+to a QTreeView, without creating anything for configs that were never shown.
+OUTPUT: one column of rows. A launcher's configs only become rows once it is expanded (canFetchMore/fetchMore),
+FETCH_BATCH_SIZE at a time. Launchers are sorted by number of configs (descending), then by name.
+ALTER: the launchers and configs, from scan results (add_launchers) and folder listings (sync_launchers, sync_configs).
+'''
+class FileTreeModel(QAbstractItemModel):
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._root = _TopLevelRow('root') # internal pointer of top level rows, config rows point to their launcher
+        self.rows: list[_TopLevelRow] = [_TopLevelRow(GLOBAL)]
+        self.launchers: dict[str, _TopLevelRow] = {}
+
+    # QAbstractItemModel
+
+    def index(self, row:int, column:int, parent=QModelIndex()) -> QModelIndex:
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row, column, self._root)
+        return self.createIndex(row, column, self.rows[parent.row()])
+
+    def parent(self, index) -> QModelIndex: #type:ignore
+        if not index.isValid():
+            return QModelIndex()
+        owner = index.internalPointer()
+        if owner is self._root:
+            return QModelIndex()
+        return self.createIndex(owner.row, 0, self._root)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if not parent.isValid():
+            return len(self.rows)
+        if parent.column() != 0 or parent.internalPointer() is not self._root:
+            return 0
+        return self.rows[parent.row()].fetched
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()) -> bool:
+        if not parent.isValid():
+            return bool(self.rows)
+        if parent.internalPointer() is not self._root:
+            return False
+        return bool(self.rows[parent.row()].configs)
+
+    def canFetchMore(self, parent) -> bool:
+        if not parent.isValid() or parent.internalPointer() is not self._root:
+            return False
+        launcher = self.rows[parent.row()]
+        return launcher.fetched < len(launcher.configs)
+
+    def fetchMore(self, parent) -> None:
+        if not self.canFetchMore(parent):
+            return
+        launcher = self.rows[parent.row()]
+        count = min(FETCH_BATCH_SIZE, len(launcher.configs) - launcher.fetched)
+
+        self.beginInsertRows(parent, launcher.fetched, launcher.fetched + count - 1)
+        launcher.fetched += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        owner = index.internalPointer()
+
+        if owner is not self._root:
+            config = owner.configs[index.row()]
+            if role == Qt.ItemDataRole.DisplayRole:
+                return config.get('displayname', config['name'])
+            if role == Qt.ItemDataRole.ToolTipRole:
+                return f"File: {config['name']}"
+            return None
+
+        row = self.rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            if row.kind == GLOBAL:
+                return "Global"
+            if row.kind == SCANNING:
+                return "Scanning…"
+            if len(row.configs) == 1:
+                return f"{row.name} (1 config)"
+            return f"{row.name} ({len(row.configs)} configs)"
+        if role == Qt.ItemDataRole.ToolTipRole and row.kind == GLOBAL:
+            return "File: scb.conf"
+        return None
+
+    def flags(self, index) -> Qt.ItemFlag:
+        if not index.isValid() or self.kind(index) == SCANNING:
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    # reading rows
+
+    def kind(self, index) -> str:
+        """Returns GLOBAL, SCANNING, LAUNCHER or CONFIG, or an empty string for an invalid index."""
+        if not index.isValid():
+            return ''
+        if index.internalPointer() is not self._root:
+            return CONFIG
+        return self.rows[index.row()].kind
+
+    def path(self, index) -> str:
+        """Returns the path of the file or launcher folder of a row, or an empty string if it has none."""
+        kind = self.kind(index)
+        if kind == GLOBAL:
+            return fman.GLOBAL_CONFIG
+        if kind == LAUNCHER:
+            return os.path.join(fman.APPID_DIR, self.rows[index.row()].name)
+        if kind == CONFIG:
+            launcher = index.internalPointer()
+            return os.path.join(fman.APPID_DIR, launcher.name, launcher.configs[index.row()]['name'])
+        return ''
+
+    def config_items(self) -> dict[str, dict]:
+        """Returns the path: file item of every config of every launcher, including those that are not rows yet."""
+        return {
+            os.path.join(fman.APPID_DIR, launcher.name, config['name']): config
+            for launcher in self.launchers.values()
+            for config in launcher.configs
+        }
+
+    def launcher_names(self) -> list[str]:
+        """Returns the folder names of the launchers, in the order they are shown."""
+        return [row.name for row in self.rows if row.kind == LAUNCHER]
+
+    def launcher_config_counts(self) -> dict[str, int]:
+        """Returns the folder name: number of files of every launcher, in the order they are shown."""
+        return {row.name: len(row.configs) for row in self.rows if row.kind == LAUNCHER}
+
+    # changing rows
+
+    def clear(self, scanning:bool=False) -> None:
+        """Removes every launcher, leaving Global and, if scanning is True, the scanning indicator."""
+        self.beginResetModel()
+        self.rows = [_TopLevelRow(GLOBAL)]
+        if scanning:
+            self.rows.append(_TopLevelRow(SCANNING))
+        self.launchers = {}
+        self._number_rows()
+        self.endResetModel()
+
+    def finish_scanning(self) -> None:
+        """Removes the scanning indicator."""
+        for row in self.rows:
+            if row.kind == SCANNING:
+                self._remove_top_level_row(row)
+                return
+
+    def add_launchers(self, launcher_items:list[dict]) -> None:
+        """Adds launcher folder items found by a scan (see ScopebuddyDirectory.scan_launchers), with their configs."""
+        for item in launcher_items:
+            launcher = _TopLevelRow(LAUNCHER, item['name'], item['inode'])
+            launcher.configs = [child for child in item['children'].values() if child['type'] == 'file']
+            self._append_top_level_row(launcher)
+        self._sort_launchers()
+
+    def sync_launchers(self, folders:dict[str, dict]) -> list[str]:
+        """Adds, removes and renames launchers to match the given folder items of AppID.
+        Returns the names of the added launchers, which have no configs yet (see sync_configs)."""
+        added = [name for name in folders if name not in self.launchers]
+        added_by_inode = {folders[name]['inode']: name for name in added}
+
+        for launcher in list(self.launchers.values()):
+            if launcher.name in folders:
+                continue
+
+            # a renamed folder keeps its inode, so the row (and whether it is expanded) is kept
+            new_name = added_by_inode.pop(launcher.inode, None)
+            if new_name is None:
+                self._remove_top_level_row(launcher)
+                continue
+            added.remove(new_name)
+            del self.launchers[launcher.name]
+            launcher.name = new_name
+            self.launchers[new_name] = launcher
+            self._launcher_changed(launcher)
+
+        for name in added:
+            self._append_top_level_row(_TopLevelRow(LAUNCHER, name, folders[name]['inode']))
+
+        self._sort_launchers()
+        return added
+
+    def sync_configs(self, launcher_name:str, files:dict[str, dict]) -> None:
+        """Adds, removes and renames the configs of a launcher to match the given file items of its folder,
+        and re-reads the display names of configs whose stat signature changed."""
+        launcher = self.launchers.get(launcher_name)
+        if launcher is None:
+            return
+        parent = self.createIndex(launcher.row, 0, self._root)
+
+        known = {config['name'] for config in launcher.configs}
+        added = [name for name in files if name not in known]
+        added_by_inode = {files[name]['inode']: name for name in added}
+
+        for row in reversed(range(len(launcher.configs))):
+            config = launcher.configs[row]
+            if config['name'] in files:
+                if fman.stat_signature_of(config) != fman.stat_signature_of(files[config['name']]):
+                    self._replace_config(launcher, row, files[config['name']])
+                continue
+
+            # a renamed file keeps its inode
+            new_name = added_by_inode.pop(config['inode'], None)
+            if new_name is None:
+                self._remove_config(launcher, row)
+                continue
+            added.remove(new_name)
+            self._replace_config(launcher, row, files[new_name])
+
+        for name in added:
+            file_data = self._read_config(files[name])
+            if launcher.fetched < len(launcher.configs):
+                launcher.configs.append(file_data) # becomes a row once the rows before it are fetched
+                continue
+            self.beginInsertRows(parent, len(launcher.configs), len(launcher.configs))
+            launcher.configs.append(file_data)
+            launcher.fetched += 1
+            self.endInsertRows()
+
+        self._launcher_changed(launcher)
+        self._sort_launchers()
+
+    @staticmethod
+    def _read_config(file_data:dict) -> dict:
+        if file_data['name'].endswith('.conf'):
+            file_data['displayname'] = fman.ScopebuddyDirectory.read_displayname(file_data['path'])
+        return file_data
+
+    def _replace_config(self, launcher:_TopLevelRow, row:int, file_data:dict) -> None:
+        launcher.configs[row] = self._read_config(file_data)
+        if row < launcher.fetched:
+            index = self.createIndex(row, 0, launcher)
+            self.dataChanged.emit(index, index)
+
+    def _remove_config(self, launcher:_TopLevelRow, row:int) -> None:
+        if row >= launcher.fetched:
+            del launcher.configs[row]
+            return
+        self.beginRemoveRows(self.createIndex(launcher.row, 0, self._root), row, row)
+        del launcher.configs[row]
+        launcher.fetched -= 1
+        self.endRemoveRows()
+
+    def _launcher_changed(self, launcher:_TopLevelRow) -> None:
+        index = self.createIndex(launcher.row, 0, self._root)
+        self.dataChanged.emit(index, index)
+
+    def _append_top_level_row(self, row:_TopLevelRow) -> None:
+        self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows))
+        row.row = len(self.rows)
+        self.rows.append(row)
+        if row.kind == LAUNCHER:
+            self.launchers[row.name] = row
+        self.endInsertRows()
+
+    def _remove_top_level_row(self, row:_TopLevelRow) -> None:
+        self.beginRemoveRows(QModelIndex(), row.row, row.row)
+        del self.rows[row.row]
+        if row.kind == LAUNCHER:
+            del self.launchers[row.name]
+        self._number_rows()
+        self.endRemoveRows()
+
+    def _number_rows(self) -> None:
+        for number, row in enumerate(self.rows):
+            row.row = number
+
+    def _sort_launchers(self) -> None:
+        """Sorts the launchers by number of configs (descending), then by name (ascending),
+        moving the rows the view keeps track of (expanded, selected) along with them."""
+        first = next((row.row for row in self.rows if row.kind == LAUNCHER), len(self.rows))
+        launchers = self.rows[first:]
+        ordered = sorted(launchers, key=lambda launcher: (-len(launcher.configs), launcher.name))
+        if ordered == launchers:
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        previous_rows = self.rows[:]
+        self.rows[first:] = ordered
+        self._number_rows()
+
+        # config rows point to their launcher, so only top level rows have to be moved
+        moved_from = []
+        moved_to = []
+        for persistent in self.persistentIndexList():
+            if persistent.internalPointer() is self._root:
+                moved_from.append(persistent)
+                moved_to.append(self.createIndex(previous_rows[persistent.row()].row, persistent.column(), self._root))
+        self.changePersistentIndexList(moved_from, moved_to)
+        self.layoutChanged.emit()
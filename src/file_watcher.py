@@ -0,0 +1,54 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2024-2025 Robert French (rfrench3, TealMango)
+
+import os
+
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
+
+import file_manager as fman
+
+'''
+The DirectoryWatcher class:
+PURPOSE: notice files and folders being created, deleted or renamed inside the scopebuddy directory,
+including changes made outside of the app.
+OUTPUT: folders_changed, emitted with the list of folders that changed once events stop arriving for a moment
+(saving a file in an editor can produce several events in a row).
+'''
+class DirectoryWatcher(QObject):
+    folders_changed = Signal(list)
+
+    def __init__(self, parent=None, delay_ms:int=150) -> None:
+        super().__init__(parent)
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self._directory_changed)
+
+        self.pending: list[str] = []
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self._emit_changes)
+
+    def watch_folders(self, launcher_folders:list[str]) -> None:
+        """Watches the scopebuddy folder, the AppID folder and the given launcher folders,
+        and stops watching any other folder."""
+        wanted = [fman.SCB_DIR, fman.APPID_DIR, *launcher_folders]
+
+        unwanted = [path for path in self.watcher.directories() if path not in wanted]
+        if unwanted:
+            self.watcher.removePaths(unwanted)
+
+        watched = set(self.watcher.directories())
+        # folders that do not exist (yet) cannot be watched, the folder above them covers their creation
+        missing = [path for path in wanted if path not in watched and os.path.isdir(path)]
+        if missing:
+            self.watcher.addPaths(missing)
+
+    def _directory_changed(self, path:str) -> None:
+        if path not in self.pending:
+            self.pending.append(path)
+        self.timer.start()
+
+    def _emit_changes(self) -> None:
+        changed, self.pending = self.pending, []
+        self.folders_changed.emit(changed)
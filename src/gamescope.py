@@ -14,12 +14,14 @@ from PySide6.QtGui import QAction
 from file_manager import ConfigFile
 import file_manager as fman
 import shared_data
+import tracing
 
 class GamescopeLogic:
+    @tracing.traced(category="logic", describe=lambda self, file, *_: {'path': file.path_to_file})
     def __init__(self, file:ConfigFile, parent_widget:QWidget) -> None:
             self.initialized = False
             self.parent_logic = None  # Will be set by main.py
-            self.file = file  # Store the file path
+            self.file: ConfigFile | None = None # set by bind
             self.parent_widget = parent_widget
             
             # Widget mapping for efficient initialization
@@ -97,12 +99,6 @@ class GamescopeLogic:
             self.reset_button.clicked.connect(self.clear_data)
             self.defaults_button.clicked.connect(self.reset_data)
 
-            self.load_data()
-
-            if self.checkBox_globalGamescope.isChecked(): #type:ignore
-                self.reset_button.setEnabled(False)
-                self.defaults_button.setEnabled(False)
-
 
             # Set up the menus
             self.menu_rendered = QMenu()
@@ -154,10 +150,28 @@ class GamescopeLogic:
             self.action_60.triggered.connect(lambda: self.lineEdit_fps.setText('60')) # type: ignore
             self.action_120.triggered.connect(lambda: self.lineEdit_fps.setText('120')) # type: ignore
 
-            self.defaults_button.setEnabled(False)
-            self.apply_button.setEnabled(False)
+            self.bind(file)
+
+    @tracing.traced(category="logic", describe=lambda self, file, *_: {'path': file.path_to_file})
+    def bind(self, file:ConfigFile) -> None:
+        """Shows a file on this page, replacing whatever it showed before. The widgets are reused, only their values change."""
+        self.initialized = False
+        self.file = file
+
+        self.load_data()
+
+        self.reset_button.setEnabled(not self.checkBox_globalGamescope.isChecked()) #type:ignore
+        self.defaults_button.setEnabled(False)
+        self.apply_button.setEnabled(False)
+
+        self.initialized = True
 
-            self.initialized = True
+    def unbind(self) -> None:
+        """Detaches the page from its file, dropping unsaved input. The page is kept to be bound to the next file."""
+        self.initialized = False
+        self.file = None
+        self.defaults_button.setEnabled(False)
+        self.apply_button.setEnabled(False)
 
     
     #######################
@@ -201,11 +215,9 @@ class GamescopeLogic:
     def load_data(self) -> None:
         """Loads the data from the file into the UI elements."""
 
-        if self.file.path_to_file == fman.GLOBAL_CONFIG:
-            self.widget_globalGamescope.hide() #type:ignore
-
-        if not self.file.gamescope_data['active']:
-            self.checkBox_globalGamescope.setChecked(True)#type:ignore
+        # set either way, the page may have shown another file before
+        self.widget_globalGamescope.setHidden(self.file.path_to_file == fman.GLOBAL_CONFIG) #type:ignore
+        self.checkBox_globalGamescope.setChecked(not self.file.gamescope_data['active']) #type:ignore
         
 
         # Split the data string into arguments
@@ -296,6 +308,7 @@ class GamescopeLogic:
         if self.file.path_to_file == fman.GLOBAL_CONFIG:
             self.checkBox_globalGamescope.setChecked(False) #type:ignore
         
+    @tracing.traced(category="logic", describe=lambda self: {'path': getattr(self.file, 'path_to_file', None)})
     def save_data(self) -> bool:
         """Does a few checks to ensure certain known incompatibilities are explained to the user,
         then saves to the config file."""
@@ -363,10 +376,11 @@ class GamescopeLogic:
         if do_not_save:
             return True
     
-        self.file.edit_gamescope_line(new_args, (not self.checkBox_globalGamescope.isChecked())) #type:ignore
+        with self.file.transaction():
+            self.file.edit_gamescope_line(new_args, (not self.checkBox_globalGamescope.isChecked())) #type:ignore
         
-
-        self.data_changed()
+        # compares the inputs to the file, once it is written
+        self.file.on_commit(self.data_changed)
 
         return False
    
@@ -5,15 +5,17 @@ from PySide6.QtWidgets import QLineEdit, QCheckBox, QDialogButtonBox, QMessageBo
 import file_manager as fman
 from file_manager import ConfigFile
 import shared_data
+import tracing
 import os
 
 class GeneralSettingsLogic:
+    @tracing.traced(category="logic", describe=lambda self, file, *_: {'path': file.path_to_file})
     def __init__(self, file:ConfigFile, parent_widget=None) -> None:
-            self.initialized = False # ensure certain functions don't run until __init__ is finished
+            self.initialized = False # ensure certain functions don't run until the page is bound to a file
 
             self.parent_logic = None  # Will be set by main.py
             self.entries = []  # Store references to all entry widgets
-            self.file = file
+            self.file: ConfigFile | None = None
             self.parent_widget = parent_widget
 
             # Initialize and connect inputs
@@ -30,11 +32,27 @@ class GeneralSettingsLogic:
 
             self.apply_button.clicked.connect(self.save_data)
             self.help_button.clicked.connect(lambda: os.system("xdg-open https://rfrench3.github.io/scopebuddy-gui/"))
-    
-            # Load lines from the file
-            self.load_data()
 
-            self.data = {
+            self.display_name.textChanged.connect(self.data_changed)
+            self.scb_noscope.stateChanged.connect(self.data_changed)
+            self.scb_auto_res.stateChanged.connect(self.data_changed)
+            self.scb_auto_ref.stateChanged.connect(self.data_changed)
+            self.scb_auto_frame.stateChanged.connect(self.data_changed)
+            self.scb_auto_hdr.stateChanged.connect(self.data_changed)
+            self.scb_auto_vrr.stateChanged.connect(self.data_changed)
+
+            self.bind(file)
+
+    @tracing.traced(category="logic", describe=lambda self, file, *_: {'path': file.path_to_file})
+    def bind(self, file:ConfigFile) -> None:
+        """Shows a file on this page, replacing whatever it showed before. The widgets are reused, only their values change."""
+        self.initialized = False
+        self.file = file
+
+        # Load lines from the file
+        self.load_data()
+
+        self.data = {
                 'name': self.display_name.text(),
                 'noscope': self.scb_noscope.isChecked(),
                 'auto_res': self.scb_auto_res.isChecked(),
@@ -44,16 +62,14 @@ class GeneralSettingsLogic:
                 'auto_vrr': self.scb_auto_vrr.isChecked()
             }
 
-            self.display_name.textChanged.connect(self.data_changed)
-            self.scb_noscope.stateChanged.connect(self.data_changed)
-            self.scb_auto_res.stateChanged.connect(self.data_changed)
-            self.scb_auto_ref.stateChanged.connect(self.data_changed)
-            self.scb_auto_frame.stateChanged.connect(self.data_changed)
-            self.scb_auto_hdr.stateChanged.connect(self.data_changed)
-            self.scb_auto_vrr.stateChanged.connect(self.data_changed)
+        self.apply_button.setDisabled(True)
+        self.initialized = True
 
-            self.apply_button.setDisabled(True)
-            self.initialized = True
+    def unbind(self) -> None:
+        """Detaches the page from its file, dropping unsaved input. The page is kept to be bound to the next file."""
+        self.initialized = False
+        self.file = None
+        self.apply_button.setDisabled(True)
 
     def data_changed(self) -> None:
         """When the user has inputted data, compare it to the saved data
@@ -83,101 +99,98 @@ class GeneralSettingsLogic:
         """Loads data from the file into the interface."""
         self.display_name.setText(self.file.print_displayname())
 
+        # every widget is set either way, the page may have shown another file before
+        self.display_name.setDisabled(self.file.print_path() == fman.GLOBAL_CONFIG)
 
-        if self.file.print_path() == fman.GLOBAL_CONFIG:
-            self.display_name.setDisabled(True)
-
-        if self.file.check_for_exact_line("SCB_NOSCOPE=1"):
-            self.scb_noscope.setChecked(True)
-
-        if self.file.check_for_exact_line("SCB_AUTO_RES=1"):
-            self.scb_auto_res.setChecked(True)
-
-        if self.file.check_for_exact_line("SCB_AUTO_REFRESH=1"):
-            self.scb_auto_ref.setChecked(True)
-
-        if self.file.check_for_exact_line("SCB_AUTO_FRAME_LIMIT=1"):
-            self.scb_auto_frame.setChecked(True)
-
-        if self.file.check_for_exact_line("SCB_AUTO_HDR=1"):
-            self.scb_auto_hdr.setChecked(True)
-
-        if self.file.check_for_exact_line("SCB_AUTO_VRR=1"):
-            self.scb_auto_vrr.setChecked(True)
+        self.scb_noscope.setChecked(self.file.check_for_exact_line("SCB_NOSCOPE=1"))
+        self.scb_auto_res.setChecked(self.file.check_for_exact_line("SCB_AUTO_RES=1"))
+        self.scb_auto_ref.setChecked(self.file.check_for_exact_line("SCB_AUTO_REFRESH=1"))
+        self.scb_auto_frame.setChecked(self.file.check_for_exact_line("SCB_AUTO_FRAME_LIMIT=1"))
+        self.scb_auto_hdr.setChecked(self.file.check_for_exact_line("SCB_AUTO_HDR=1"))
+        self.scb_auto_vrr.setChecked(self.file.check_for_exact_line("SCB_AUTO_VRR=1"))
 
         
 
+    @tracing.traced(category="logic", describe=lambda self: {'path': getattr(self.file, 'path_to_file', None)})
     def save_data(self) -> bool:
         """Saves data from each of the elements into the file."""
 
         parent_window = self.parent_widget.window() if self.parent_widget else None
 
 
-        if self.file.print_displayname() != self.display_name.text():
-            self.data['name'] = self.display_name.text()
-            self.file.edit_displayname(self.data['name'])
-            #TODO: update file selector screen with new displayname 
+        # every change is written to the file at once, and only remembered as saved once it is
+        saved_data = {}
+        with self.file.transaction():
+            if self.file.print_displayname() != self.display_name.text():
+                saved_data['name'] = self.display_name.text()
+                self.file.edit_displayname(saved_data['name'])
+                #TODO: update file selector screen with new displayname 
 
-        # Update all elements that don't get their own function at the same time
-        lines_to_change = {}
+            # Update all elements that don't get their own function at the same time
+            lines_to_change = {}
         
 
-        # if noscope needs to be removed:
-        if (not self.scb_noscope.isChecked()) and self.file.check_for_exact_line("SCB_NOSCOPE=1"):
-
-            # make sure this wont lead to regular mangohud being paired with gamescope
-            if (
-                self.file.check_for_exact_line("export mangohud") or
-                self.file.check_for_exact_line("export MANGOHUD=1")
-            ):
-                result = fman.load_message_box(
-                    parent_window,
-                    "Warning!",
-                    ("You have MangoHUD as an environment variable and are attempting to enable Gamescope!\n"
-                    "This is not supported.\n"
-                    "You should either use the \"MangoHUD Overlay\" checkbox inside of Gamescope or disable Gamescope!"),
-                    QMessageBox.Icon.Warning,
-                    QMessageBox.StandardButton.Ignore | QMessageBox.StandardButton.Cancel
-                )
-                if result != QMessageBox.StandardButton.Ignore:
-                    return True
+            # if noscope needs to be removed:
+            if (not self.scb_noscope.isChecked()) and self.file.check_for_exact_line("SCB_NOSCOPE=1"):
+
+                # make sure this wont lead to regular mangohud being paired with gamescope
+                if (
+                    self.file.check_for_exact_line("export mangohud") or
+                    self.file.check_for_exact_line("export MANGOHUD=1")
+                ):
+                    result = fman.load_message_box(
+                        parent_window,
+                        "Warning!",
+                        ("You have MangoHUD as an environment variable and are attempting to enable Gamescope!\n"
+                        "This is not supported.\n"
+                        "You should either use the \"MangoHUD Overlay\" checkbox inside of Gamescope or disable Gamescope!"),
+                        QMessageBox.Icon.Warning,
+                        QMessageBox.StandardButton.Ignore | QMessageBox.StandardButton.Cancel
+                    )
+                    if result != QMessageBox.StandardButton.Ignore:
+                        return True
                 
-            lines_to_change["SCB_NOSCOPE=1"] = "#SCB_NOSCOPE=1"
-            self.data['noscope'] = False
+                lines_to_change["SCB_NOSCOPE=1"] = "#SCB_NOSCOPE=1"
+                saved_data['noscope'] = False
     
-        def handle_auto(box:QCheckBox, line:str, data_key:str):
-            if (not box.isChecked()) and self.file.check_for_exact_line(line):
-                lines_to_change[line] = f"#{line}"
-                self.data[data_key] = False
-
-            if box.isChecked() and (not self.file.check_for_exact_line(line)):
-                lines_to_change[f"#{line}"] = line
-                self.data[data_key] = True
-
-        autos_list = [
-            (self.scb_noscope, "SCB_NOSCOPE=1", "noscope"),
-            (self.scb_auto_res, "SCB_AUTO_RES=1", "auto_res"),
-            (self.scb_auto_ref, "SCB_AUTO_REFRESH=1", "auto_ref"),
-            (self.scb_auto_frame, "SCB_AUTO_FRAME_LIMIT=1", "auto_frame"),
-            (self.scb_auto_hdr, "SCB_AUTO_HDR=1", "auto_hdr"),
-            (self.scb_auto_vrr, "SCB_AUTO_VRR=1", "auto_vrr"),
-            ]
-
-        for box, line, data_key in autos_list:
-            handle_auto(box, line, data_key)
+            def handle_auto(box:QCheckBox, line:str, data_key:str):
+                if (not box.isChecked()) and self.file.check_for_exact_line(line):
+                    lines_to_change[line] = f"#{line}"
+                    saved_data[data_key] = False
+
+                if box.isChecked() and (not self.file.check_for_exact_line(line)):
+                    lines_to_change[f"#{line}"] = line
+                    saved_data[data_key] = True
+
+            autos_list = [
+                (self.scb_noscope, "SCB_NOSCOPE=1", "noscope"),
+                (self.scb_auto_res, "SCB_AUTO_RES=1", "auto_res"),
+                (self.scb_auto_ref, "SCB_AUTO_REFRESH=1", "auto_ref"),
+                (self.scb_auto_frame, "SCB_AUTO_FRAME_LIMIT=1", "auto_frame"),
+                (self.scb_auto_hdr, "SCB_AUTO_HDR=1", "auto_hdr"),
+                (self.scb_auto_vrr, "SCB_AUTO_VRR=1", "auto_vrr"),
+                ]
+
+            for box, line, data_key in autos_list:
+                handle_auto(box, line, data_key)
             
-        list_current = []
-        list_new = []
+            list_current = []
+            list_new = []
 
-        for key, value in lines_to_change.items():
-            list_current.append(key)
-            list_new.append(value)
+            for key, value in lines_to_change.items():
+                list_current.append(key)
+                list_new.append(value)
 
-        self.file.edit_exact_lines(list_current,list_new)
+            self.file.edit_exact_lines(list_current,list_new)
         
+        self.file.on_commit(lambda: self.mark_saved(saved_data))
+        return False
+
+    def mark_saved(self, saved_data:dict) -> None:
+        """Remembers the saved settings, once they are written to the file."""
+        self.data.update(saved_data)
         self.apply_button.setDisabled(True)
         shared_data.unsaved_changes = False
-        return False
             
 
         
@@ -9,14 +9,16 @@ from PySide6.QtWidgets import QLineEdit, QDialogButtonBox
 import file_manager as fman
 from file_manager import ConfigFile
 import shared_data
+import tracing
 
 entry:str = fman.ui_launch_options_entry
 
 class LaunchOptionsLogic:
+    @tracing.traced(category="logic", describe=lambda self, file, *_: {'path': file.path_to_file})
     def __init__(self, file:ConfigFile, parent_widget=None) -> None:
             self.initialized = False
             self.parent_logic = None  # Will be set by main.py
-            self.file = file
+            self.file: ConfigFile | None = None
             self.parent_widget = parent_widget
 
             # Initialize and connect inputs
@@ -30,12 +32,26 @@ class LaunchOptionsLogic:
             self.help_button.clicked.connect(lambda: os.system("xdg-open https://rfrench3.github.io/scopebuddy-gui/#launch_options"))
             self.line_edit.textChanged.connect(self.data_changed)
 
-            # Load line from the file
-            self.load_data()
-            self.saved_data = self.file.print_launch_options().strip()
+            self.bind(file)
 
-            self.apply_button.setEnabled(False)
-            self.initialized = True
+    @tracing.traced(category="logic", describe=lambda self, file, *_: {'path': file.path_to_file})
+    def bind(self, file:ConfigFile) -> None:
+        """Shows a file on this page, replacing whatever it showed before. The widgets are reused, only their values change."""
+        self.initialized = False
+        self.file = file
+
+        # Load line from the file
+        self.load_data()
+        self.saved_data = self.file.print_launch_options().strip()
+
+        self.apply_button.setEnabled(False)
+        self.initialized = True
+
+    def unbind(self) -> None:
+        """Detaches the page from its file, dropping unsaved input. The page is kept to be bound to the next file."""
+        self.initialized = False
+        self.file = None
+        self.apply_button.setEnabled(False)
 
     def data_changed(self) -> None:
         """When the user has inputted data, compare it to the saved data
@@ -59,15 +75,21 @@ class LaunchOptionsLogic:
         argument = self.file.print_launch_options().strip()
         self.line_edit.setText(argument)
         
+    @tracing.traced(category="logic", describe=lambda self: {'path': getattr(self.file, 'path_to_file', None)})
     def save_data(self) -> bool:
         """Save the user input to the file's command+=' ' line."""
         new_line = f' {self.line_edit.text().strip()}'
-        self.file.edit_launch_options(new_line)
+        saved_data = self.line_edit.text().strip()
+        with self.file.transaction():
+            self.file.edit_launch_options(new_line)
+        self.file.on_commit(lambda: self.mark_saved(saved_data))
+        return False
 
-        self.saved_data = self.line_edit.text().strip()
+    def mark_saved(self, saved_data:str) -> None:
+        """Remembers the saved launch options, once they are written to the file."""
+        self.saved_data = saved_data
         self.apply_button.setEnabled(False)
         shared_data.unsaved_changes = False
-        return False
 
 
 
@@ -12,28 +12,31 @@
 
 import sys
 import os
+import importlib
 
 # PySide6, Qt Designer UI files
 from PySide6.QtWidgets import (
     QApplication, QStackedWidget, QStatusBar,
     QTabWidget, QLabel, QPushButton, QDialog,
     QLineEdit, QMessageBox, QMainWindow, QWidget, 
-    QVBoxLayout, QTreeWidget, QTreeWidgetItem, 
-    QToolButton, QMenu
+    QVBoxLayout, QTreeWidget, QTreeWidgetItem, QTreeView,
+    QToolButton, QMenu, QListWidget, QListWidgetItem
     )
-from PySide6.QtSvgWidgets import QSvgWidget
 
-from PySide6.QtGui import QAction
+from PySide6.QtGui import QAction, QKeySequence, QShortcut
 
-from PySide6.QtCore import QSignalBlocker, Qt
+from PySide6.QtCore import QSignalBlocker, Qt, QEvent, QTimer
 
 # import custom logic
 sys.path.insert(0, "/app/share/scopebuddygui") # flatpak path
+import tracing
 import file_manager as fman
-from env_var import EnvVarLogic
-from gamescope import GamescopeLogic
-from general_settings import GeneralSettingsLogic
-from launch_options import LaunchOptionsLogic
+from directory_index import DirectoryIndex
+from file_watcher import DirectoryWatcher
+from directory_scanner import DirectoryScanner
+import file_tree_model
+from search_index import SearchIndex
+from settings_index import SettingsIndex, QueryError
 
 import shared_data
 
@@ -51,16 +54,27 @@ ui_env_vars = fman.ui_env_vars
 ui_gamescope = fman.ui_gamescope
 ui_launch_options = fman.ui_launch_options
 
+# pages of the config editor, in tab order: (tab title, ui file, "module.LogicClass", attribute of ApplicationLogic)
+# the logic modules are only imported once their page is first shown
+EDITOR_PAGES: list[tuple[str, str, str, str]] = [
+    ("General Settings", ui_general_settings, "general_settings.GeneralSettingsLogic", 'general_settings_logic'),
+    ("Environment Variables", ui_env_vars, "env_var.EnvVarLogic", 'env_vars_logic'),
+    ("Gamescope", ui_gamescope, "gamescope.GamescopeLogic", 'gamescope_logic'),
+    ("Launch Options", ui_launch_options, "launch_options.LaunchOptionsLogic", 'launch_options_logic')
+]
+
 # Dialog of welcome page
 dialog_new_file = os.path.join(DATA_DIR, "new_file_create.ui")
 dialog_new_launcher = os.path.join(DATA_DIR, "new_folder_create.ui")
 dialog_about = os.path.join(DATA_DIR, "dialog_about.ui")
+dialog_quick_open = os.path.join(DATA_DIR, "quick_open.ui")
+dialog_settings_search = os.path.join(DATA_DIR, "settings_search.ui")
 
-
-fman.create_directory()
-fman.ScopebuddyDirectory.create_file('scb.conf','Global Config file.',fman.SCB_DIR)
+# remembers the scopebuddy directory between runs, so only changed files are rescanned
+directory_index = DirectoryIndex()
 
 class MainWindow(QMainWindow):
+    @tracing.traced(category="ui")
     def __init__(self):
         super().__init__()
         self.logic = None  # type: ApplicationLogic | None
@@ -69,7 +83,7 @@ class MainWindow(QMainWindow):
         self.ui_widget = fman.load_widget(ui_main)
         self.setCentralWidget(self.ui_widget)
         self.setWindowTitle("Scopebuddy GUI")
-        self.setWindowIcon(fman.icon)
+        self.setWindowIcon(fman.icon())
         
     def closeEvent(self, event):
         """This ensures that attempting to close the window while a file is loaded results in a dialog,
@@ -96,6 +110,7 @@ class MainWindow(QMainWindow):
             event.accept()
 
 class ApplicationLogic:
+    @tracing.traced(category="ui")
     def __init__(self, window): 
 
         # Load data for the main window
@@ -106,12 +121,40 @@ class ApplicationLogic:
         self.button_new_config = self.window.findChild(QPushButton, 'button_new_config')
         self.open_folder = self.window.findChild(QPushButton, "open_folder")
         self.about = self.window.findChild(QPushButton, "button_about")
-        self.file_tree:QTreeWidget = self.window.findChild(QTreeWidget, 'file_tree')
+        self.search_settings = self.window.findChild(QPushButton, "button_search_settings")
+        self.file_tree:QTreeView = self.window.findChild(QTreeView, 'file_tree')
         self.large_logo = self.window.findChild(QWidget, "widget_app_icon")
 
         self.file_tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.file_tree.customContextMenuRequested.connect(self.show_context_menu)
 
+        # configs are only turned into rows once their launcher is expanded
+        self.file_tree_model = file_tree_model.FileTreeModel(self.window)
+        self.file_tree.setModel(self.file_tree_model)
+
+        # keeps the file tree up to date with changes made inside and outside of the app
+        self.directory_watcher = DirectoryWatcher(self.window)
+        self.directory_watcher.folders_changed.connect(self.apply_folder_changes)
+
+        # Ctrl+P searches every config by name. Each scan builds it on its worker thread,
+        # changes seen afterwards are applied to it when it is opened
+        self.search_index = SearchIndex()
+        self.search_index_outdated: bool = False
+
+        # fills the file tree without blocking the window
+        self.directory_scanner = DirectoryScanner(self.window, index=directory_index, search_index=self.search_index)
+        self.directory_scanner.launchers_found.connect(self.file_tree_model.add_launchers)
+        self.directory_scanner.finished.connect(self.scan_finished)
+        self.pending_folder_changes: list[str] = []
+
+        self.quick_open_shortcut = QShortcut(QKeySequence("Ctrl+P"), self.window)
+        self.quick_open_shortcut.activated.connect(self.quick_open_pressed)
+
+        # finds configs by their gamescope arguments, exports and SCB_ settings
+        self.settings_index = SettingsIndex()
+        self.index_outdated_folders: set[str] = set() # changed since the last scan, see search_settings_pressed
+        self.settings_search_queued: bool = False
+
         # Initialize logic references (but don't create widgets yet)
         self.general_settings_logic = None
         self.env_vars_logic = None
@@ -120,10 +163,11 @@ class ApplicationLogic:
         self.interface_loaded: bool = False # redundancy to ensure ui doesn't load multiple times at once
                 
 
-        svg_widget = QSvgWidget(fman.svg_path)
-        svg_widget.setFixedSize(128, 128)
-        layout = self.large_logo.layout()
-        layout.addWidget(svg_widget)
+        # the logo is rendered once the window is on screen
+        self.logo = QLabel()
+        self.logo.setFixedSize(128, 128)
+        self.large_logo.layout().addWidget(self.logo)
+        QTimer.singleShot(0, lambda: self.logo.setPixmap(fman.logo_pixmap()))
 
         # Track last index and intercept changes when there are unsaved changes
         self._last_tab_index = self.mainFileEdit.currentIndex()
@@ -133,14 +177,18 @@ class ApplicationLogic:
         self.button_new_config.clicked.connect(self.new_config_pressed)
         self.open_folder.clicked.connect(self.open_folder_clicked)
         self.about.clicked.connect(self.about_dialog)
-        self.file_tree.itemClicked.connect(self.tree_clicked)
+        self.search_settings.clicked.connect(self.search_settings_pressed)
+        self.file_tree.clicked.connect(self.tree_clicked)
 
         # Add a permanent label and pushButton to the status bar
         self.status_label = QLabel("File: None")
         self.status_button = QPushButton("Exit File")
         self.status_button.clicked.connect(self.unload_selected_file)
+        self.apply_all_button = QPushButton("Apply All")
+        self.apply_all_button.clicked.connect(self.apply_all_tabs)
 
         self.statusBar.addWidget(self.status_button)  # Left side
+        self.statusBar.addWidget(self.apply_all_button)
         
         self.statusBar.addPermanentWidget(self.status_label)  # Right side
         
@@ -150,74 +198,96 @@ class ApplicationLogic:
         self.mainFileEdit.setCurrentIndex(0)
         self.statusBar.hide()
 
-        # Locate game-specific configs
-        self.appid_files = fman.ScopebuddyDirectory()
-
         # load all configs into UI
         self.reload_file_tree()
         
     def reload_file_tree(self) -> None:
-        """Clears all entries from self.file_tree, and then reloads them."""
-    
-        self.file_tree.clear()
-
-        globalconfig = QTreeWidgetItem()
-        globalconfig.setText(0, "Global")
-        globalconfig.setToolTip(0, "File: scb.conf")
-        self.file_tree.addTopLevelItem(globalconfig)
-
-        directory = fman.ScopebuddyDirectory()
-        
-        appid_contents = directory.full_directory.get('AppID', {})
-        
-        launcher_data = []
-        
-        # for each subfolder of AppID (the launchers), count folder name and number of files to put into a list for sorting
-        if appid_contents.get('children'):
-            for name, item_data in appid_contents['children'].items():
-                configs_list = []
-                if item_data['type'] == 'folder' and item_data.get('children'):
-                    num_configs = 0
-                    
-                    for child_name, child_data in item_data['children'].items():
-                        if child_data['type'] == 'file':
-                            num_configs += 1  
-                            configs_list.append((child_data['name'], child_data['displayname']))
+        """Clears all entries from self.file_tree, and then reloads them.
+        Global can be opened right away, the launchers are added as the background scan finds them."""
+        self.file_tree_model.clear(scanning=True)
 
+        # Locate game-specific configs
+        self.pending_folder_changes: list[str] = []
+        self.index_outdated_folders = set()
+        self.directory_scanner.start()
+
+    def scan_finished(self, full_directory:dict) -> None:
+        """Removes the scanning indicator, then applies the changes that happened during the scan."""
+        self.file_tree_model.finish_scanning()
+
+        changes, self.pending_folder_changes = self.pending_folder_changes, []
+        self.apply_folder_changes(changes)
+        self.search_index_outdated = bool(changes) # the scan brought it up to date with everything else
+
+    def apply_folder_changes(self, folders:list[str]) -> None:
+        """Applies the files and launchers that were added, removed, renamed or edited inside the given folders
+        to the existing rows of self.file_tree, instead of rebuilding it."""
+        if self.directory_scanner.scanning:
+            # the scan may not have reached these folders yet, wait for it to finish
+            self.pending_folder_changes.extend(folders)
+            return
 
-                    launcher_data.append((name, num_configs, configs_list))
-                elif item_data['type'] == 'folder':
-                    launcher_data.append((name, 0, configs_list))
-        
-        # Sort by number of configs (descending), then by name (ascending)
-        launcher_data.sort(key=lambda x: (-x[1], x[0]))
-        
-        for name, num_configs, filename_displayname in launcher_data:
-            launcher = QTreeWidgetItem()
-            
-            if num_configs == 1:
-                launcher.setText(0, f"{name} (1 config)")
-            else:
-                launcher.setText(0, f"{name} ({num_configs} configs)")
-
-            self.file_tree.addTopLevelItem(launcher)
-
-            # add configs to tree widget
-            for filename, displayname in filename_displayname:
-                config_item = QTreeWidgetItem(launcher)
-                config_item.setText(0, displayname)
-                config_item.setToolTip(0, f"File: {filename}")
+        if fman.SCB_DIR in folders or APPID_DIR in folders:
+            try:
+                items, _ = fman.ScopebuddyDirectory.list_folder(APPID_DIR, False)
+            except OSError:
+                items = {}
+            added = self.file_tree_model.sync_launchers({name: item for name, item in items.items() if item['type'] == 'folder'})
+            folders = folders + [os.path.join(APPID_DIR, name) for name in added]
+
+        appid_folder = os.path.realpath(APPID_DIR)
+        for name in self.file_tree_model.launcher_names():
+            path = os.path.join(APPID_DIR, name)
+            # AppID/steam is a symlink to AppID, so changes to AppID are changes to that launcher too
+            if path in folders or (APPID_DIR in folders and os.path.realpath(path) == appid_folder):
+                try:
+                    items, _ = fman.ScopebuddyDirectory.list_folder(path, True)
+                except OSError:
+                    items = {}
+                self.file_tree_model.sync_configs(name, {name: item for name, item in items.items() if item['type'] == 'file'})
+
+        self.search_index_outdated = True
+        self.index_outdated_folders.update(folders)
+
+        self.directory_watcher.watch_folders([os.path.join(APPID_DIR, name) for name in self.file_tree_model.launcher_names()])
         
     def _on_tab_changed(self) -> None:
         """Notifies user if they leave the tab with unsaved changes."""
 
         current_index: int = self.mainFileEdit.currentIndex()
+        self.show_page(current_index)
 
         if not shared_data.unsaved_changes:
             self._last_tab_index = current_index
             return
 
         self.confirm_before_proceed(tab_changed=True)
+
+    def page_logic(self, index:int):
+        """Returns the logic of a config editor page, or None if the page was not built (see show_page)."""
+        if not 0 <= index < len(EDITOR_PAGES):
+            return None
+        return getattr(self, EDITOR_PAGES[index][3])
+
+    @tracing.traced(category="ui", describe=lambda self, index: {'page': EDITOR_PAGES[index][0] if 0 <= index < len(EDITOR_PAGES) else index})
+    def show_page(self, index:int) -> None:
+        """Gets a config editor page ready to show the selected file, when its tab is shown.\n
+        A page is built the first time, until then its tab is an empty placeholder, so opening a file only builds
+        the visible page. Afterwards the page is kept, and only bound to the selected file if it shows another one."""
+        if not self.interface_loaded or selected_config is None or not 0 <= index < len(EDITOR_PAGES):
+            return
+        page_logic = self.page_logic(index)
+        if page_logic is not None:
+            if page_logic.file is not selected_config:
+                page_logic.bind(selected_config)
+            return
+
+        _, ui_file, logic_class, attribute = EDITOR_PAGES[index]
+        module_name, class_name = logic_class.rsplit('.', 1)
+        logic_class = getattr(importlib.import_module(module_name), class_name)
+        page_widget = fman.load_widget(ui_file)
+        setattr(self, attribute, logic_class(selected_config, page_widget))
+        self.mainFileEdit.widget(index).layout().addWidget(page_widget)
         
     def confirm_before_proceed(self, tab_changed:bool=False) -> QMessageBox.StandardButton:  #type:ignore
         """Prompt the user if there are unsaved changes. Revert to the previous
@@ -254,21 +324,37 @@ class ApplicationLogic:
             return QMessageBox.StandardButton.Discard
         
         elif result == QMessageBox.StandardButton.Apply:
-            match unsaved_index:
-                case 0:
-                    self.general_settings_logic.save_data() #type:ignore
-                case 1:
-                    self.env_vars_logic.save_data() #type:ignore
-                case 2:
-                    self.gamescope_logic.save_data() #type:ignore
-                case 3:
-                    self.launch_options_logic.save_data() #type:ignore
+            # only a page that was built can have unsaved changes
+            page_logic = self.page_logic(unsaved_index)
+            if page_logic is not None:
+                page_logic.save_data()
 
             shared_data.unsaved_changes = False
             self.mainFileEdit.setCurrentIndex(current_index)
             self._last_tab_index = current_index
             return QMessageBox.StandardButton.Apply
 
+    def apply_all_tabs(self) -> bool:
+        """Saves every page with unsaved changes, writing the selected file only once.
+        Returns True if any page cancelled its save.\n
+        Each page is only marked as saved once the file is written (see ConfigFile.on_commit)."""
+        if selected_config is None:
+            return False
+
+        cancelled = False
+        with selected_config.transaction():
+            for page_logic in map(self.page_logic, range(len(EDITOR_PAGES))):
+                if page_logic is not None and page_logic.apply_button.isEnabled():
+                    cancelled = page_logic.save_data() or cancelled
+
+        if not cancelled:
+            shared_data.unsaved_changes = False
+
+        # the display name is on the first line
+        if any(start == 0 for start, _ in selected_config.last_changes):
+            self.status_label.setText(f"File ({selected_config.print_filename()}): {selected_config.print_displayname()}")
+        return cancelled
+
     def open_folder_clicked(self):
         """Shows a popup window with instructions for opening the Scopebuddy folder."""
         fman.load_message_box(
@@ -295,29 +381,39 @@ class ApplicationLogic:
             return    
 
         def unload_interface(self) -> None:
-            """Fully unloads interface elements."""
-                
-            # Clear all tabs (this will delete the widgets)
-            self.mainFileEdit.clear()
-            
-            # Reset logic references
-            self.general_settings_logic = None
-            self.env_vars_logic = None
-            self.gamescope_logic = None
-            self.launch_options_logic = None
+            """Detaches the pages from the file, they are kept for the next file (see show_page)."""
+            for page_logic in map(self.page_logic, range(len(EDITOR_PAGES))):
+                if page_logic is not None:
+                    page_logic.unbind()
             self.interface_loaded = False
 
         global selected_config
         unload_interface(self)
+        # the display name may have been edited
+        if selected_config:
+            self.apply_folder_changes([os.path.dirname(selected_config.print_path())])
         selected_config = None
 
-        self.reload_file_tree()
-
         self.mainFileSelect.setCurrentIndex(0)
         self.statusBar.hide()
 
     def tree_clicked(self) -> None:
         """opens the config file the user clicked."""
+        index = self.file_tree.currentIndex()
+        kind = self.file_tree_model.kind(index)
+
+        if kind == file_tree_model.LAUNCHER:
+            # launcher clicked - expand/collapse it
+            self.file_tree.setExpanded(index, not self.file_tree.isExpanded(index))
+            return
+        elif kind not in (file_tree_model.GLOBAL, file_tree_model.CONFIG):
+            return
+
+        self.open_config(self.file_tree_model.path(index))
+
+    @tracing.traced(category="ui", describe=lambda self, filepath: {'path': filepath})
+    def open_config(self, filepath:str) -> None:
+        """opens a config file in the editing interface."""
         def load_with_selected_file(self,selected_file:fman.ConfigFile) -> None:
             """Loads the file selected by the user, then loads the interface with it."""
             def load_interface(self,file:fman.ConfigFile) -> None:
@@ -327,25 +423,19 @@ class ApplicationLogic:
                     print("PROBLEM! THE UI ATTEMPTED TO LOAD WHILE ALREADY LOADED!")
                     return
                     
-                general_settings_widget = fman.load_widget(ui_general_settings)
-                env_vars_widget = fman.load_widget(ui_env_vars)
-                gamescope_widget = fman.load_widget(ui_gamescope)
-                launch_options_widget = fman.load_widget(ui_launch_options)
-
-                # Initialize the logic for the ui pages
-                self.general_settings_logic = GeneralSettingsLogic(file, general_settings_widget)
-                self.env_vars_logic = EnvVarLogic(file, env_vars_widget)
-                self.gamescope_logic = GamescopeLogic(file, gamescope_widget)
-                self.launch_options_logic = LaunchOptionsLogic(file, launch_options_widget)
-                    
-                # Clear existing tabs and add new ones
-                self.mainFileEdit.clear()
-                self.mainFileEdit.addTab(general_settings_widget, "General Settings")
-                self.mainFileEdit.addTab(env_vars_widget, "Environment Variables")
-                self.mainFileEdit.addTab(gamescope_widget, "Gamescope")
-                self.mainFileEdit.addTab(launch_options_widget, "Launch Options")
+                with QSignalBlocker(self.mainFileEdit):
+                    # the first time, add a placeholder tab for each page, pages are built once shown (see show_page)
+                    if self.mainFileEdit.count() != len(EDITOR_PAGES):
+                        self.mainFileEdit.clear()
+                        for title, *_ in EDITOR_PAGES:
+                            placeholder = QWidget()
+                            QVBoxLayout(placeholder).setContentsMargins(0, 0, 0, 0)
+                            self.mainFileEdit.addTab(placeholder, title)
+                    self.mainFileEdit.setCurrentIndex(0)
                 
                 self.interface_loaded = True
+                self._last_tab_index = self.mainFileEdit.currentIndex()
+                self.show_page(self._last_tab_index)
             
             
             global selected_config
@@ -353,35 +443,92 @@ class ApplicationLogic:
             load_interface(self, selected_config) # load the interface elements given the selected file
             self.mainFileSelect.setCurrentIndex(1)
             self.statusBar.show()
-        
-        item = self.file_tree.currentItem()
-        
-        # Check if this is a top-level item
-        parent = item.parent()
-        
-        if parent is None:
-            # Top-level item clicked
-            if item.text(0) == "Global":
-                filepath = GLOBAL_CONFIG
-            else:
-                # Non-Global top-level item - expand/collapse it
-                item.setExpanded(not item.isExpanded())
-                return
-        else:
-            # Sub-item clicked - get launcher folder from parent
 
-            # launcher' ('# configs), split off the ' (# configs)' part
-            launcher_folder = parent.text(0).rsplit(' (', 1)[0]
-            filename = item.toolTip(0)[6:]  # Remove "File: " prefix
-            filepath = os.path.join(fman.APPID_DIR, launcher_folder, filename)
-
-        file = fman.ConfigFile(filepath)
+        fman.ensure_scopebuddy_directory() # Global may be opened before the first scan created it
+        file = fman.config_cache.get(filepath)
         load_with_selected_file(self, file)
         self.status_label.setText(f"File ({file.print_filename()}): {file.print_displayname()}")
 
+    def quick_open_pressed(self) -> None:
+        """Opens a palette that searches every config by display name, file name or AppID,
+        then opens the chosen config (after closing the current one)."""
+        if self.directory_scanner.scanning:
+            # the scan is still building the search index, the palette can be typed into and shows results once it is done
+            dialog = QuickOpenDialog(self.search_index, self.window, ready=False)
+            self.directory_scanner.finished.connect(
+                lambda _: (self.update_search_index(), dialog.index_ready()), Qt.ConnectionType.SingleShotConnection
+            )
+        else:
+            self.update_search_index()
+            dialog = QuickOpenDialog(self.search_index, self.window)
+
+        if dialog.exec() != QDialog.DialogCode.Accepted or not dialog.selected_path:
+            return
+        self.switch_to_config(dialog.selected_path)
+
+    def update_search_index(self) -> None:
+        """Applies the changes seen since the last scan to the search index, only the changed configs are indexed again."""
+        if self.search_index_outdated:
+            self.search_index.sync(self.file_tree_model.config_items())
+            self.search_index_outdated = False
+
+    def search_settings_pressed(self) -> None:
+        """Opens a window that finds configs by their settings (see SettingsIndex.query),
+        then opens the chosen config (after closing the current one)."""
+        if self.directory_scanner.scanning:
+            # the scan holds the directory index until it is done, so the window opens once it has finished
+            if not self.settings_search_queued:
+                self.settings_search_queued = True
+                self.directory_scanner.finished.connect(self._search_settings_after_scan, Qt.ConnectionType.SingleShotConnection)
+            return
+
+        # the last scan indexed every config, only the folders that changed since then are indexed again
+        folders, self.index_outdated_folders = self.index_outdated_folders, set()
+        for folder in folders:
+            directory_index.update_folder(directory_index.aliases.get(folder, folder))
+
+        # configs are indexed once, under the folder they are really in (AppID for AppID/steam),
+        # so they are looked up there and shown under the launcher
+        launcher_folders = {}
+        for name in self.file_tree_model.launcher_names():
+            folder = os.path.join(APPID_DIR, name)
+            if folder in directory_index.aliases:
+                launcher_folders.setdefault(directory_index.aliases[folder], folder)
+            else:
+                launcher_folders[folder] = folder
+
+        files = {}
+        for path, data in directory_index.files.items():
+            folder, filename = os.path.split(path)
+            if path == GLOBAL_CONFIG:
+                files[path] = data
+            elif folder in launcher_folders:
+                files[os.path.join(launcher_folders[folder], filename)] = data
+        self.settings_index.sync(files)
+
+        dialog = SettingsSearchDialog(self.settings_index, self.window)
+        if dialog.exec() != QDialog.DialogCode.Accepted or not dialog.selected_path:
+            return
+        self.switch_to_config(dialog.selected_path)
+
+    def _search_settings_after_scan(self, _full_directory:dict) -> None:
+        self.settings_search_queued = False
+        self.search_settings_pressed()
+
+    def switch_to_config(self, filepath:str) -> None:
+        """Closes the current config (if the user agrees), then opens another one."""
+        if selected_config:
+            self.unload_selected_file()
+            if selected_config: # the user chose to keep editing
+                return
+        self.open_config(filepath)
+
     def new_config_pressed(self) -> None:
         """opens a modal that has the user create a new config with a Steam AppID.""" 
-        dialog = NewFileDialog(self.window)
+        dialog = NewFileDialog(self.file_tree_model, self.window)
+        if self.directory_scanner.scanning:
+            # the launchers are listed from the file tree, which is complete once the scan is
+            self.directory_scanner.finished.connect(lambda _: dialog.reload_launcher_widget(), Qt.ConnectionType.SingleShotConnection)
         result = dialog.exec()
 
         if result != QDialog.DialogCode.Accepted:  
@@ -410,7 +557,7 @@ class ApplicationLogic:
                 dialog.data['display_name'],
                 directory
             )
-            self.reload_file_tree()
+            self.apply_folder_changes([APPID_DIR, directory])
 
     def about_dialog(self) -> None:
         """Opens a dialog with information and links to Scopebuddy and the SCBGUI docs."""
@@ -421,10 +568,11 @@ class ApplicationLogic:
         gui_gh: QPushButton = dialog.findChild(QPushButton, 'gui_gh') #type:ignore
         gui_docs: QPushButton = dialog.findChild(QPushButton, 'gui_docs') #type:ignore
 
-        svg_widget = QSvgWidget(fman.svg_path)
-        svg_widget.setFixedSize(128, 128)
+        logo = QLabel()
+        logo.setFixedSize(128, 128)
+        logo.setPixmap(fman.logo_pixmap())
         layout: QVBoxLayout = image.layout() #type:ignore
-        layout.addWidget(svg_widget)
+        layout.addWidget(logo)
 
         scb_gh.clicked.connect(lambda: os.system("xdg-open https://github.com/HikariKnight/ScopeBuddy"))
         scb_docs.clicked.connect(lambda: os.system("xdg-open https://docs.bazzite.gg/Advanced/scopebuddy/"))
@@ -435,34 +583,31 @@ class ApplicationLogic:
 
     def show_context_menu(self, position) -> None:
 
-        item = self.file_tree.itemAt(position)
-        if not item:
+        index = self.file_tree.indexAt(position)
+        kind = self.file_tree_model.kind(index)
+        path = self.file_tree_model.path(index)
+        if not path:
             return
         
         menu = QMenu()
 
-        # Check if top-level item or child
-        parent = item.parent()
-        
-        if parent is None:
-            # Top-level item (Global or launcher folder)
-            if item.text(0) == "Global":
-                open_action = QAction("Open", self.window)
-                open_action.triggered.connect(lambda: self.tree_clicked())
-                delete_action = QAction("Restore Default", self.window)
-                delete_action.triggered.connect(self.remake_global)
-                menu.addAction(open_action)
-                menu.addAction(delete_action)
-            else:
-                # Launcher folder
-                add_config = QAction("Add Config", self.window)
-                # run new_config_pressed with the launcher argument passed
-                add_config.triggered.connect(lambda: self.new_config_pressed())
-                menu.addAction(add_config)
-                
-                delete_folder = QAction("Delete Launcher", self.window)
-                delete_folder.triggered.connect(lambda: self.delete_item(item, 'folder'))
-                menu.addAction(delete_folder)
+        if kind == file_tree_model.GLOBAL:
+            open_action = QAction("Open", self.window)
+            open_action.triggered.connect(lambda: self.tree_clicked())
+            delete_action = QAction("Restore Default", self.window)
+            delete_action.triggered.connect(self.remake_global)
+            menu.addAction(open_action)
+            menu.addAction(delete_action)
+        elif kind == file_tree_model.LAUNCHER:
+            # Launcher folder
+            add_config = QAction("Add Config", self.window)
+            # run new_config_pressed with the launcher argument passed
+            add_config.triggered.connect(lambda: self.new_config_pressed())
+            menu.addAction(add_config)
+            
+            delete_folder = QAction("Delete Launcher", self.window)
+            delete_folder.triggered.connect(lambda: self.delete_item(path, 'folder'))
+            menu.addAction(delete_folder)
         else:
             # Config file item
             open_action = QAction("Open", self.window)
@@ -470,15 +615,15 @@ class ApplicationLogic:
             menu.addAction(open_action)
             
             delete_action = QAction("Delete", self.window)
-            delete_action.triggered.connect(lambda: self.delete_item(item, 'file'))
+            delete_action.triggered.connect(lambda: self.delete_item(path, 'file'))
             menu.addAction(delete_action)
         
         menu.exec(self.file_tree.viewport().mapToGlobal(position))
     
-    def delete_item(self, item, type):
+    def delete_item(self, path:str, type:str):
         """After an "Are you sure" dialog, pass the file/folder to fman for deletion."""
 
-        if item.text(0).rsplit(' (', 1)[0] == 'steam':
+        if type == 'folder' and os.path.basename(path) == 'steam':
             fman.load_message_box(
             self.window,
             "Deletion Not Allowed",
@@ -500,18 +645,13 @@ class ApplicationLogic:
             return 
 
         if type == 'file':
-            launcher_folder = item.parent().text(0).rsplit(' (', 1)[0]
-            filename = item.toolTip(0)[6:]
-            path = os.path.join(fman.APPID_DIR, launcher_folder, filename)
             fman.ScopebuddyDirectory.delete_file(path)
         elif type == 'folder':
-            launcher_folder = item.text(0).rsplit(' (', 1)[0]
-            path = os.path.join(fman.APPID_DIR, launcher_folder)
             fman.ScopebuddyDirectory.delete_folder(path)
         else:
             raise ValueError
         
-        self.reload_file_tree()
+        self.apply_folder_changes([os.path.dirname(path)])
     
     def remake_global(self):
         """After an "Are you sure" dialog, have fman reset the global file."""
@@ -528,10 +668,134 @@ class ApplicationLogic:
         
         fman.ScopebuddyDirectory.regenerate_global()
 
+class QuickOpenDialog(QDialog):
+    def __init__(self, search_index:SearchIndex, parent=None, ready:bool=True):
+        super().__init__(parent)
+
+        self.ui_widget = fman.load_widget(dialog_quick_open)
+        self.search_index = search_index
+        self.ready: bool = ready # False while a scan is building the search index, see index_ready
+        self.selected_path: str = ''
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.ui_widget)
+
+        self.setWindowTitle("Open Config")
+        self.setWindowIcon(fman.icon())
+
+        self.search: QLineEdit = self.ui_widget.findChild(QLineEdit, 'search') # type: ignore
+        self.results: QListWidget = self.ui_widget.findChild(QListWidget, 'results') # type: ignore
+
+        self.search.textChanged.connect(self.update_results)
+        self.search.returnPressed.connect(self.open_result)
+        self.results.itemActivated.connect(self.open_result)
+
+        # the arrow keys move through the results while typing
+        self.search.installEventFilter(self)
+
+        if not ready:
+            self.update_results('')
+
+    def eventFilter(self, watched, event) -> bool:
+        if (watched is self.search and event.type() == QEvent.Type.KeyPress
+                and event.key() in (Qt.Key.Key_Up, Qt.Key.Key_Down, Qt.Key.Key_PageUp, Qt.Key.Key_PageDown)):
+            QApplication.sendEvent(self.results, event)
+            return True
+        return super().eventFilter(watched, event)
+
+    def index_ready(self) -> None:
+        """Shows the results of what was typed while the search index was being built."""
+        self.ready = True
+        self.update_results(self.search.text())
+
+    def update_results(self, text:str) -> None:
+        self.results.clear()
+        if not self.ready:
+            waiting = QListWidgetItem("Indexing configs...")
+            waiting.setFlags(Qt.ItemFlag.NoItemFlags)
+            self.results.addItem(waiting)
+            return
+        for path in self.search_index.search(text):
+            entry = self.search_index.entries[path]
+            launcher = os.path.basename(os.path.dirname(path))
+            result = QListWidgetItem(f"{entry['displayname']}    {launcher}/{entry['filename']}")
+            result.setData(Qt.ItemDataRole.UserRole, path)
+            self.results.addItem(result)
+        self.results.setCurrentRow(0)
+
+    def open_result(self) -> None:
+        result = self.results.currentItem()
+        if result is None or not self.ready:
+            return
+        self.selected_path = result.data(Qt.ItemDataRole.UserRole)
+        self.accept()
+
+class SettingsSearchDialog(QDialog):
+    def __init__(self, settings_index:SettingsIndex, parent=None):
+        super().__init__(parent)
+
+        self.ui_widget = fman.load_widget(dialog_settings_search)
+        self.settings_index = settings_index
+        self.selected_path: str = ''
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.ui_widget)
+
+        self.setWindowTitle("Search Settings")
+        self.setWindowIcon(fman.icon())
+
+        self.query: QLineEdit = self.ui_widget.findChild(QLineEdit, 'query') # type: ignore
+        self.status: QLabel = self.ui_widget.findChild(QLabel, 'status') # type: ignore
+        self.results: QListWidget = self.ui_widget.findChild(QListWidget, 'results') # type: ignore
+        self.help_text: str = self.status.text()
+
+        self.query.textChanged.connect(self.update_results)
+        self.query.returnPressed.connect(self.open_result)
+        self.results.itemActivated.connect(self.open_result)
+
+    def update_results(self, text:str) -> None:
+        self.results.clear()
+        if not text.strip():
+            self.status.setText(self.help_text)
+            return
+
+        try:
+            paths = self.settings_index.query(text)
+        except QueryError as e:
+            self.status.setText(str(e))
+            return
+
+        for path in paths:
+            displayname = self.settings_index.entries[path]['displayname']
+            if path == GLOBAL_CONFIG:
+                location = os.path.basename(path)
+            else:
+                location = f"{os.path.basename(os.path.dirname(path))}/{os.path.basename(path)}"
+            result = QListWidgetItem(f"{displayname}    {location}")
+            result.setData(Qt.ItemDataRole.UserRole, path)
+            self.results.addItem(result)
+        self.results.setCurrentRow(0)
+
+        if len(paths) == 1:
+            self.status.setText("1 config matches")
+        else:
+            self.status.setText(f"{len(paths)} configs match")
+
+    def open_result(self) -> None:
+        result = self.results.currentItem()
+        if result is None:
+            return
+        self.selected_path = result.data(Qt.ItemDataRole.UserRole)
+        self.accept()
+
 #FIXME: pressing ESC inside the dialog results in a blank window
 class NewFileDialog(QDialog):
-    def __init__(self, parent=None):
+    def __init__(self, tree_model:file_tree_model.FileTreeModel, parent=None):
         super().__init__(parent)
+        self.file_tree_model = tree_model
+        self.created_launchers: list[str] = [] # not in the file tree until the watcher sees them
         
         self.ui_widget = fman.load_widget(dialog_new_file)
 
@@ -547,7 +811,7 @@ class NewFileDialog(QDialog):
         layout.addWidget(self.ui_widget)
         
         self.setWindowTitle("Create New Config")
-        self.setWindowIcon(fman.icon)
+        self.setWindowIcon(fman.icon())
 
         self.previous: QPushButton = self.ui_widget.findChild(QPushButton, 'previous')  # type: ignore
         self.next: QPushButton = self.ui_widget.findChild(QPushButton, 'next')  # type: ignore
@@ -603,24 +867,11 @@ class NewFileDialog(QDialog):
     def reload_launcher_widget(self):
         self.launchers.clear()
 
-        directory = fman.ScopebuddyDirectory()
-        
-        appid_contents = directory.full_directory.get('AppID', {})
-        
-        launcher_data = []
-        
-        # for each subfolder of AppID (the launchers), count folder name and number of files to put into a list for sorting
-        if appid_contents.get('children'):
-            for name, item_data in appid_contents['children'].items():
-                if item_data['type'] == 'folder' and item_data.get('children'):
-                    num_configs = 0
-                    for child_name, child_data in item_data['children'].items():
-                        if child_data['type'] == 'file':
-                            num_configs += 1  
-
-                    launcher_data.append((name, num_configs))
-                elif item_data['type'] == 'folder':
-                    launcher_data.append((name, 0))
+        # the launchers and their number of files come from the file tree, rather than scanning AppID again
+        config_counts = self.file_tree_model.launcher_config_counts()
+        for name in self.created_launchers:
+            config_counts.setdefault(name, 0)
+        launcher_data = list(config_counts.items())
         
         # Sort by number of configs (descending), then by name (ascending)
         launcher_data.sort(key=lambda x: (-x[1], x[0]))
@@ -639,7 +890,7 @@ class NewFileDialog(QDialog):
     def new_launcher(self):
         dialog = QDialog(self)
         dialog.setWindowTitle("Create New Launcher")
-        dialog.setWindowIcon(fman.icon)
+        dialog.setWindowIcon(fman.icon())
         
         layout = QVBoxLayout(dialog)
         
@@ -670,6 +921,7 @@ class NewFileDialog(QDialog):
             if launcher_name and not fman.is_filename_invalid(launcher_name):
                 launcher_path = os.path.join(APPID_DIR, launcher_name)
                 os.makedirs(launcher_path, exist_ok=True)
+                self.created_launchers.append(launcher_name)
                 self.reload_launcher_widget()
             else:
                 fman.load_message_box(
@@ -705,13 +957,17 @@ class NewFileDialog(QDialog):
         else:
             self.save.setEnabled(False)
 
-# Logic that loads the app
-app = QApplication([])
-icon = fman.icon
+def main() -> int:
+    """Loads the app, returns its exit code once the window is closed."""
+    app = QApplication(sys.argv)
+
+    window_main = MainWindow()
+    logic = ApplicationLogic(window_main.ui_widget)
+    window_main.logic = logic
+
+    window_main.show()
+    return app.exec()
 
-window_main = MainWindow()
-logic = ApplicationLogic(window_main.ui_widget)
-window_main.logic = logic
 
-window_main.show()
-app.exec()
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2024-2025 Robert French (rfrench3, TealMango)
+
+import re
+from collections import Counter
+from heapq import nsmallest
+from bisect import insort
+
+# anything that is not a letter or digit separates words, both in names and in what the user types
+WORD_SEPARATORS = re.compile(r"[^0-9a-z]+")
+
+# most results returned by a search
+SEARCH_LIMIT: int = 50
+
+# above this many candidates, ranking each one is too slow to keep up with typing,
+# so whole word matches come first and the rest are only ordered by name
+RANK_LIMIT: int = 2000
+
+'''
+The SearchIndex class:
+PURPOSE: find configs by display name, file name or AppID (the file name without .conf) as the user types,
+quickly enough for tens of thousands of configs.
+STORED: for every config, the words of its display name and file name. A trigram index (every 3 letters of every word)
+finds words containing a typed word, and a prefix index (first 1 and 2 letters of every word) covers shorter typed words.
+ALTER: sync, which only re-indexes the configs that were added, removed or changed since the last sync.
+'''
+class SearchIndex:
+    def __init__(self) -> None:
+        self.entries: dict[str, dict] = {} # path: {displayname, filename, words, text, key}
+        self.trigrams: dict[str, set[str]] = {} # trigram: paths
+        self.prefixes: dict[str, set[str]] = {} # first 1 or 2 letters of a word: paths
+        self.words: dict[str, set[str]] = {} # word: paths
+        self.ordered: list[str] = [] # paths sorted by name, shortest first
+        self.order: dict[str, int] = {} # path: position in self.ordered
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def sync(self, configs:dict[str, dict]) -> None:
+        """Brings the index up to date with configs, a dictionary of path: file item
+        (see ScopebuddyDirectory.return_filesystem_information). Unchanged configs are not indexed again,
+        and a few changes are moved into place in the name order instead of sorting every config again."""
+        removed: set[str] = set()
+        added: list[str] = []
+        for path in [path for path in self.entries if path not in configs]:
+            self._remove(path)
+            removed.add(path)
+
+        for path, item in configs.items():
+            displayname = item.get('displayname', item['name'])
+            key = (item['mtime'], item['size'], item['inode'], displayname)
+            entry = self.entries.get(path)
+            if entry is not None:
+                if entry['key'] == key:
+                    continue
+                self._remove(path)
+                removed.add(path)
+            self._add(path, item['name'], displayname, key)
+            added.append(path)
+
+        if not removed and not added:
+            return
+        if len(removed) + len(added) > len(self.entries) // 16:
+            self.ordered = sorted(self.entries, key=lambda path: self._name_key(self.entries[path]))
+        else:
+            if removed:
+                self.ordered = [path for path in self.ordered if path not in removed]
+            for path in added:
+                insort(self.ordered, path, key=lambda path: self._name_key(self.entries[path]))
+        self.order = {path: position for position, path in enumerate(self.ordered)}
+
+    def search(self, query:str, limit:int=SEARCH_LIMIT) -> list[str]:
+        """Returns the paths of the configs that best match the query, best first.\n
+        Configs that contain every typed word come first, ranked by how closely each word matches
+        (a whole word, the start of a word, anywhere in a word). If there are none,
+        configs that share enough trigrams with the query are returned instead, so typos still find something."""
+        tokens = [token for token in WORD_SEPARATORS.split(query.lower()) if token]
+        if not tokens:
+            return []
+
+        # the longest words narrow the candidates down the most, so they go first
+        candidates: set[str] | None = None
+        for token in sorted(tokens, key=len, reverse=True):
+            paths = self._paths_containing(token)
+            candidates = paths if candidates is None else candidates & paths
+            if not candidates:
+                break
+
+        if not candidates:
+            return self._fuzzy_search(''.join(tokens), limit)
+
+        # the trigrams of a longer token can come from different words, so check the words really contain it
+        # (a single trigram, or a word prefix for shorter tokens, is exact)
+        entries = self.entries
+        long_tokens = [token for token in tokens if len(token) > 3]
+        def contains_tokens(path:str) -> bool:
+            return all(token in entries[path]['text'] for token in long_tokens)
+
+        if len(candidates) <= RANK_LIMIT:
+            matches = [path for path in candidates if contains_tokens(path)]
+            results = nsmallest(limit, matches, key=lambda path: self._rank(entries[path], tokens))
+        else:
+            # too many to rank one by one: whole word matches first, then the rest by name
+            whole_words = candidates.intersection(*(self.words.get(token, ()) for token in tokens))
+            results = nsmallest(limit, whole_words, key=self.order.__getitem__)
+            if len(results) < limit:
+                # walk the configs in name order rather than sorting every candidate, there are at least
+                # RANK_LIMIT of them, so the walk usually stops long before the end
+                others = candidates - whole_words
+                for path in self.ordered:
+                    if path in others and contains_tokens(path):
+                        results.append(path)
+                        if len(results) >= limit:
+                            break
+
+        if results:
+            return results
+        return self._fuzzy_search(''.join(tokens), limit)
+
+    def _paths_containing(self, token:str) -> set[str]:
+        """Returns the paths whose words may contain token (a superset, for tokens longer than 3 letters)."""
+        if len(token) < 3:
+            return self.prefixes.get(token, set())
+
+        token_trigrams = sorted(self._trigrams_of(token), key=lambda trigram: len(self.trigrams.get(trigram, ())))
+        paths = self.trigrams.get(token_trigrams[0])
+        if not paths:
+            return set()
+        return paths.intersection(*(self.trigrams.get(trigram, ()) for trigram in token_trigrams[1:]))
+
+    @staticmethod
+    def _rank(entry:dict, tokens:list[str]) -> tuple:
+        """Sort key of a match, lower is better."""
+        score = 0
+        for token in tokens:
+            if token in entry['words']:
+                score += 3
+            elif any(word.startswith(token) for word in entry['words']):
+                score += 2
+            else:
+                score += 1
+        return (-score, *SearchIndex._name_key(entry))
+
+    @staticmethod
+    def _name_key(entry:dict) -> tuple:
+        return (len(entry['displayname']), entry['displayname'].lower(), entry['filename'])
+
+    def _fuzzy_search(self, query:str, limit:int) -> list[str]:
+        query_trigrams = self._trigrams_of(query)
+        if not query_trigrams:
+            return []
+
+        shared = Counter()
+        for trigram in query_trigrams:
+            shared.update(self.trigrams.get(trigram, ()))
+
+        needed = max(1, len(query_trigrams) // 2)
+        matches = [path for path, count in shared.items() if count >= needed]
+        return nsmallest(limit, matches, key=lambda path: (-shared[path], self.order[path]))
+
+    @staticmethod
+    def _trigrams_of(word:str) -> set[str]:
+        return {word[i:i + 3] for i in range(len(word) - 2)}
+
+    def _add(self, path:str, filename:str, displayname:str, key:tuple) -> None:
+        appid = filename[:-5] if filename.endswith('.conf') else filename
+        words = {word for word in WORD_SEPARATORS.split(f"{displayname} {appid}".lower()) if word}
+        self.entries[path] = {
+            'displayname': displayname,
+            'filename': filename,
+            'words': words,
+            'text': ' '.join(words),
+            'key': key
+        }
+
+        for word in words:
+            self.words.setdefault(word, set()).add(path)
+            for trigram in self._trigrams_of(word):
+                self.trigrams.setdefault(trigram, set()).add(path)
+            for prefix in {word[:1], word[:2]}:
+                self.prefixes.setdefault(prefix, set()).add(path)
+
+    def _remove(self, path:str) -> None:
+        entry = self.entries.pop(path)
+        for word in entry['words']:
+            self._discard(self.words, {word}, path)
+            self._discard(self.trigrams, self._trigrams_of(word), path)
+            self._discard(self.prefixes, {word[:1], word[:2]}, path)
+
+    @staticmethod
+    def _discard(postings:dict[str, set[str]], keys:set[str], path:str) -> None:
+        for key in keys:
+            paths = postings.get(key)
+            if paths is not None:
+                paths.discard(path)
+                if not paths:
+                    del postings[key]
@@ -0,0 +1,207 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2024-2025 Robert French (rfrench3, TealMango)
+
+import re, shlex
+
+# the parts of a config that can be searched, used to limit a term to one of them (env:DXVK_ASYNC)
+FIELD_ALIASES: dict[str, str] = {
+    'env': 'env',
+    'export': 'env',
+    'gamescope': 'gamescope',
+    'gs': 'gamescope',
+    'scb': 'scb'
+}
+
+QUERY_TOKENS = re.compile(r"\(|\)|[^\s()]+")
+
+# gamescope options are case sensitive (-w and -W are different options), the names of env and SCB_ settings are not
+CASE_SENSITIVE_FIELDS: set[str] = {'gamescope'}
+
+
+class QueryError(ValueError):
+    """Raised for a query that cannot be understood, the message says why."""
+
+
+'''
+The SettingsIndex class:
+PURPOSE: answer questions such as "which configs pass --hdr-enabled to gamescope", "which set SCB_NOSCOPE=1"
+or "which export DXVK_ASYNC" without opening every config.
+STORED: an inverted index from each term to the paths of the configs containing it. The terms come from the parsed
+summary of each config (see ConfigFile.summary): exported variables, the arguments of an active gamescope line and
+active SCB_ settings, as NAME and NAME=value. Each term is stored with its field (env:, gamescope:, scb:),
+a term without a field is looked up in all of them. Gamescope terms keep their case, the others are lowercased.
+ALTER: sync, which only re-indexes the configs whose stat signature changed.
+'''
+class SettingsIndex:
+    def __init__(self) -> None:
+        self.entries: dict[str, dict] = {} # path: {displayname, terms, key}
+        self.postings: dict[str, set[str]] = {} # term: paths
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def sync(self, files:dict[str, dict]) -> None:
+        """Brings the index up to date with files, a dictionary of path: {mtime, size, inode, summary}
+        (see DirectoryIndex.files). Configs whose mtime, size and inode did not change are not indexed again."""
+        for path in [path for path in self.entries if path not in files]:
+            self._remove(path)
+
+        for path, data in files.items():
+            key = (data['mtime'], data['size'], data['inode'])
+            entry = self.entries.get(path)
+            if entry is not None:
+                if entry['key'] == key:
+                    continue
+                self._remove(path)
+            self._add(path, data['summary'], key)
+
+    def query(self, text:str) -> list[str]:
+        """Returns the paths of the configs matching a boolean query, sorted by display name.\n
+        Terms are matched without regard to case, except gamescope arguments, and can be limited to a field (env:, gamescope: or gs:, scb:)
+        or end in * to match every term starting with the rest. Terms next to each other must all match,
+        OR matches either side, NOT excludes, and parentheses group.
+        Raises QueryError if the query cannot be understood."""
+        tokens = QUERY_TOKENS.findall(text)
+        if not tokens:
+            return []
+
+        self._tokens = tokens
+        self._position = 0
+        paths = self._parse_or()
+        if self._position < len(tokens):
+            raise QueryError(f"Unexpected '{tokens[self._position]}'")
+
+        return sorted(paths, key=lambda path: (self.entries[path]['displayname'].lower(), path))
+
+    # query parsing, lowest precedence first
+
+    def _parse_or(self) -> set[str]:
+        paths = self._parse_and()
+        while self._peek_keyword() == 'or':
+            self._position += 1
+            paths = paths | self._parse_and()
+        return paths
+
+    def _parse_and(self) -> set[str]:
+        paths = self._parse_not()
+        while self._position < len(self._tokens) and self._tokens[self._position] != ')' and self._peek_keyword() != 'or':
+            if self._peek_keyword() == 'and':
+                self._position += 1
+            paths = paths & self._parse_not()
+        return paths
+
+    def _parse_not(self) -> set[str]:
+        if self._peek_keyword() == 'not':
+            self._position += 1
+            return set(self.entries) - self._parse_not()
+        return self._parse_term()
+
+    def _parse_term(self) -> set[str]:
+        if self._position >= len(self._tokens):
+            raise QueryError("The query ends too early")
+
+        token = self._tokens[self._position]
+        self._position += 1
+
+        if token == '(':
+            paths = self._parse_or()
+            if self._position >= len(self._tokens) or self._tokens[self._position] != ')':
+                raise QueryError("Missing ')'")
+            self._position += 1
+            return paths
+        if token == ')':
+            raise QueryError("Unexpected ')'")
+        if token.lower() in ('and', 'or'):
+            raise QueryError(f"'{token}' needs a term on both sides")
+
+        return self._lookup(token)
+
+    def _peek_keyword(self) -> str:
+        if self._position >= len(self._tokens):
+            return ''
+        token = self._tokens[self._position].lower()
+        return token if token in ('and', 'or', 'not') else ''
+
+    def _lookup(self, term:str) -> set[str]:
+        field, separator, rest = term.partition(':')
+        if separator and field.lower() in FIELD_ALIASES:
+            keys = [self._key(FIELD_ALIASES[field.lower()], rest)]
+        else:
+            keys = [self._key(field, term) for field in set(FIELD_ALIASES.values())]
+
+        paths = set()
+        for key in keys:
+            if not key.endswith('*'):
+                paths |= self.postings.get(key, set())
+                continue
+            prefix = key[:-1]
+            for indexed_term, indexed_paths in self.postings.items():
+                if indexed_term.startswith(prefix):
+                    paths |= indexed_paths
+        return paths
+
+    @staticmethod
+    def _key(field:str, term:str) -> str:
+        """Returns the posting key of a term in a field, lowercased unless the field is case sensitive."""
+        return f"{field}:{term if field in CASE_SENSITIVE_FIELDS else term.lower()}"
+
+    # indexing
+
+    @staticmethod
+    def summary_terms(summary:dict) -> set[str]:
+        """Returns the terms of a parsed config summary, each with its field (see _key)."""
+        terms: set[tuple[str, str]] = set()
+
+        for line in summary['exports']:
+            terms.update(('env', term) for term in SettingsIndex._assignment_terms(line))
+
+        for line in summary['settings']:
+            terms.update(('scb', term) for term in SettingsIndex._assignment_terms(line))
+
+        if summary['gamescope_active'] and summary['gamescope_args']:
+            try:
+                arguments = shlex.split(summary['gamescope_args'])
+            except ValueError:
+                arguments = summary['gamescope_args'].split()
+
+            for i, argument in enumerate(arguments):
+                terms.add(('gamescope', argument))
+                if argument.startswith('-') and '=' in argument:
+                    terms.add(('gamescope', argument.split('=', 1)[0]))
+                elif argument.startswith('-') and i + 1 < len(arguments) and not arguments[i + 1].startswith('-'):
+                    # -W 2560 can be searched as -W=2560
+                    terms.add(('gamescope', f"{argument}={arguments[i + 1]}"))
+
+        return {SettingsIndex._key(field, term) for field, term in terms}
+
+    @staticmethod
+    def _assignment_terms(line:str) -> list[str]:
+        """Returns NAME and NAME=value for a line such as NAME=value or NAME="value" # comment."""
+        name, separator, value = line.partition('=')
+        name = name.strip()
+        if not name:
+            return []
+        if not separator:
+            return [name]
+
+        value = value.split('#', 1)[0].strip().strip('"\'')
+        return [name, f"{name}={value}"]
+
+    def _add(self, path:str, summary:dict, key:tuple) -> None:
+        terms = self.summary_terms(summary)
+        self.entries[path] = {
+            'displayname': summary['displayname'],
+            'terms': terms,
+            'key': key
+        }
+        for term in terms:
+            self.postings.setdefault(term, set()).add(path)
+
+    def _remove(self, path:str) -> None:
+        entry = self.entries.pop(path)
+        for term in entry['terms']:
+            paths = self.postings.get(term)
+            if paths is not None:
+                paths.discard(path)
+                if not paths:
+                    del self.postings[term]
@@ -0,0 +1,123 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2024-2025 Robert French (rfrench3, TealMango)
+
+'''
+Opt-in tracing: records how long reading and writing configs, scanning, loading UI files, building and saving the
+editor pages took, and writes it as Chrome trace event JSON when the app exits (open it in https://ui.perfetto.dev
+or chrome://tracing).
+
+Tracing is turned on with --trace or --trace=path.json on the command line, or SCOPEBUDDY_GUI_TRACE=path.json
+(SCOPEBUDDY_GUI_TRACE=1 for the default path). It is decided once, when this module is first imported, so that
+when it is off, traced returns functions unchanged and span returns a shared no-op context: traced code then runs
+exactly as if it was not traced.
+'''
+
+import os, sys, json, time, atexit, threading
+from contextlib import nullcontext, contextmanager
+from functools import wraps
+from inspect import isgeneratorfunction
+
+# set to a file path to record a trace, or to 1 for the default path (see trace_path)
+TRACE_ENV:str = "SCOPEBUDDY_GUI_TRACE"
+DEFAULT_TRACE_PATH:str = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "scopebuddy-gui", f"trace-{os.getpid()}.json"
+)
+
+def _requested_path() -> str | None:
+    """Returns where the trace should be written, or None if tracing is off."""
+    for argument in sys.argv[1:]:
+        if argument == "--trace":
+            return DEFAULT_TRACE_PATH
+        if argument.startswith("--trace="):
+            return argument.split('=', 1)[1] or DEFAULT_TRACE_PATH
+    value = os.environ.get(TRACE_ENV, '')
+    if value in ('', '0'):
+        return None
+    return DEFAULT_TRACE_PATH if value == '1' else value
+
+trace_path: str | None = _requested_path()
+if trace_path is not None:
+    trace_path = os.path.abspath(trace_path) # the working directory may change before it is written
+enabled: bool = trace_path is not None
+
+_events: list[dict] = []
+_thread_names: dict[int, str] = {}
+_NO_SPAN = nullcontext()
+
+
+def _now() -> float:
+    """Microseconds on the clock the trace uses."""
+    return time.perf_counter_ns() / 1000
+
+def _record(name:str, category:str, start:float, args:dict | None) -> None:
+    thread_id = threading.get_native_id()
+    if thread_id not in _thread_names:
+        _thread_names[thread_id] = threading.current_thread().name
+    event = {'name': name, 'cat': category, 'ph': 'X', 'ts': start, 'dur': _now() - start, 'pid': os.getpid(), 'tid': thread_id}
+    if args:
+        event['args'] = args
+    _events.append(event) # list.append is atomic, spans can end on any thread
+
+
+@contextmanager
+def _span(name:str, category:str, args:dict | None):
+    start = _now()
+    try:
+        yield
+    except Exception as e:
+        args = {**(args or {}), 'error': repr(e)}
+        raise
+    finally:
+        _record(name, category, start, args)
+
+def span(name:str, category:str='app', **args):
+    """Context manager that records the code inside it as one span. Arguments are shown with the span."""
+    if not enabled:
+        return _NO_SPAN
+    return _span(name, category, args)
+
+
+def traced(name:str | None=None, category:str='app', describe=None):
+    """Decorator that records each call of a function as a span, named after the function unless name is given.
+    describe is called with the same arguments as the function, and returns the arguments to show with the span.
+    A generator is recorded from its first to its last item."""
+    def decorator(function):
+        if not enabled:
+            return function
+        span_name = name or function.__qualname__
+
+        if isgeneratorfunction(function):
+            @wraps(function)
+            def traced_generator(*args, **kwargs):
+                with _span(span_name, category, describe(*args, **kwargs) if describe else None):
+                    yield from function(*args, **kwargs)
+            return traced_generator
+
+        @wraps(function)
+        def traced_function(*args, **kwargs):
+            with _span(span_name, category, describe(*args, **kwargs) if describe else None):
+                return function(*args, **kwargs)
+        return traced_function
+    return decorator
+
+
+def write(path:str | None=None) -> None:
+    """Writes every span recorded so far as Chrome trace event JSON, to path or the path tracing was turned on with."""
+    path = path or trace_path
+    if path is None:
+        return
+    metadata = [
+        {'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': thread_id, 'args': {'name': thread_name}}
+        for thread_id, thread_name in list(_thread_names.items())
+    ]
+    try:
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': metadata + list(_events), 'displayTimeUnit': 'ms'}, file)
+        print(f"Trace of {len(_events)} spans written to {path}")
+    except OSError as e:
+        print(f"Unable to write the trace: {e}")
+
+if enabled:
+    atexit.register(write)
@@ -0,0 +1,86 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2024-2025 Robert French (rfrench3, TealMango)
+
+'''
+Checks that SearchIndex.search orders results the same way on both sides of RANK_LIMIT,
+and that sync keeps the name order when only a few configs change.
+Run with python3 -m unittest discover tests (or pytest).
+'''
+
+import os, sys, unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+import search_index
+from search_index import SearchIndex, RANK_LIMIT
+
+
+def make_configs(count:int) -> dict[str, dict]:
+    """Returns count configs whose display names contain "game" as a whole word, at the start of a word
+    or inside one, with numeric AppIDs as file names."""
+    names = ["game {}", "gamer {}", "endgame {}", "{} game night", "gameplay {}"]
+    return {
+        f"/configs/launcher{i % 7}/{1000 + i}.conf": {
+            'name': f"{1000 + i}.conf",
+            'displayname': names[i % len(names)].format(i),
+            'mtime': 1, 'size': 1, 'inode': i
+        }
+        for i in range(count)
+    }
+
+
+def expected_by_name(index:SearchIndex, query:str, limit:int) -> list[str]:
+    """The order above RANK_LIMIT: whole word matches by name, then every other candidate by name."""
+    tokens = [token for token in search_index.WORD_SEPARATORS.split(query.lower()) if token]
+    def contains(path:str, token:str) -> bool:
+        # shorter tokens are looked up by the start of a word, longer ones anywhere in a word
+        if len(token) < 3:
+            return any(word.startswith(token) for word in index.entries[path]['words'])
+        return token in index.entries[path]['text']
+    matches = [path for path in index.entries if all(contains(path, token) for token in tokens)]
+    whole_words = sorted((path for path in matches if all(token in index.entries[path]['words'] for token in tokens)), key=index.order.__getitem__)
+    others = sorted(set(matches) - set(whole_words), key=index.order.__getitem__)
+    return (whole_words + others)[:limit]
+
+
+class SearchIndexRankLimitTest(unittest.TestCase):
+    def search(self, count:int, query:str, limit:int) -> tuple[SearchIndex, list[str]]:
+        index = SearchIndex()
+        index.sync(make_configs(count))
+        return index, index.search(query, limit)
+
+    def test_at_rank_limit_results_are_ranked(self):
+        index, results = self.search(RANK_LIMIT, "game", 60)
+        matches = [path for path in index.entries if "game" in index.entries[path]['text']]
+        expected = sorted(matches, key=lambda path: SearchIndex._rank(index.entries[path], ["game"]))[:60]
+        self.assertEqual(results, expected)
+
+    def test_above_rank_limit_results_are_in_name_order(self):
+        # more results than whole word matches, so the other candidates are walked in name order too
+        for limit in (50, RANK_LIMIT // 2, RANK_LIMIT + 1):
+            with self.subTest(limit=limit):
+                index, results = self.search(RANK_LIMIT + 1, "game", limit)
+                self.assertEqual(results, expected_by_name(index, "game", limit))
+
+    def test_above_rank_limit_short_query(self):
+        index, results = self.search(RANK_LIMIT * 3, "ga", 100)
+        self.assertEqual(results, expected_by_name(index, "ga", 100))
+
+
+class SearchIndexSyncTest(unittest.TestCase):
+    def test_changes_keep_the_name_order(self):
+        configs = make_configs(RANK_LIMIT)
+        index = SearchIndex()
+        index.sync(configs)
+
+        paths = list(configs)
+        del configs[paths[0]]
+        configs[paths[1]] = dict(configs[paths[1]], mtime=2, displayname="a renamed game")
+        configs["/configs/launcher0/1.conf"] = {'name': "1.conf", 'displayname': "zzz game", 'mtime': 1, 'size': 1, 'inode': -1}
+        index.sync(configs)
+
+        self.assertEqual(index.ordered, sorted(index.entries, key=lambda path: SearchIndex._name_key(index.entries[path])))
+        self.assertEqual([index.order[path] for path in index.ordered], list(range(len(index.ordered))))
+
+
+if __name__ == "__main__":
+    unittest.main()
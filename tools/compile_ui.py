@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+#
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2024-2025 Robert French (rfrench3, TealMango)
+
+'''
+Compiles the Qt Designer forms (src/*.ui) into Python modules ahead of time, so the app does not parse their XML
+every time a page or dialog is opened (see file_manager.load_widget).
+
+Usage: compile_ui.py [folder with the .ui files] [output folder]
+Both default to src/. Each form.ui becomes uic_form.py, the output of pyside6-uic followed by
+BASE_CLASS (the Qt class of the top level widget) and FORM_CLASS (the generated Ui_ class).
+'''
+
+import os, sys, glob, shutil, subprocess
+import xml.etree.ElementTree as ElementTree
+
+SOURCE_DIR:str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+
+def uic_command() -> list[str]:
+    """Returns the command that runs pyside6-uic, from PATH or from the PySide6 package."""
+    uic = shutil.which("pyside6-uic")
+    if uic:
+        return [uic]
+    return [sys.executable, "-m", "PySide6.scripts.pyside_tool", "uic"]
+
+
+def compile_form(ui_file:str, output_dir:str) -> str:
+    """Compiles one .ui file, returns the path of the module it was written to."""
+    top_level = ElementTree.parse(ui_file).getroot().find('widget')
+    if top_level is None:
+        print(f"{ui_file} has no widget to compile")
+        raise ValueError(ui_file)
+
+    result = subprocess.run([*uic_command(), ui_file], check=True, capture_output=True, text=True)
+
+    name = os.path.splitext(os.path.basename(ui_file))[0]
+    module_path = os.path.join(output_dir, f"uic_{name}.py")
+    with open(module_path, 'w') as file:
+        file.write(result.stdout)
+        file.write("\n# used by file_manager.load_widget\n")
+        file.write(f"BASE_CLASS = '{top_level.get('class')}'\n")
+        file.write(f"FORM_CLASS = Ui_{top_level.get('name')}\n")
+    return module_path
+
+
+def main() -> None:
+    source_dir = sys.argv[1] if len(sys.argv) > 1 else SOURCE_DIR
+    output_dir = sys.argv[2] if len(sys.argv) > 2 else source_dir
+    os.makedirs(output_dir, exist_ok=True)
+
+    for ui_file in sorted(glob.glob(os.path.join(source_dir, "*.ui"))):
+        print(f"{ui_file} -> {compile_form(ui_file, output_dir)}")
+
+
+if __name__ == "__main__":
+    main()